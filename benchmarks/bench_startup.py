@@ -0,0 +1,87 @@
+"""Startup-time regression guard for the dc front-end.
+
+Runs lightweight ``dc`` invocations under ``python -X importtime`` and fails
+when a heavy module (``requests`` and friends, or Pillow) is imported where
+it is not needed, or when the total import time exceeds the budget.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs N] [--max-import-ms MS]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# (dc arguments, modules that must not be imported for them)
+SCENARIOS = [
+    (["--version"], ["requests", "urllib3", "discord_cli.discord_api", "PIL"]),
+    (["--help"], ["requests", "urllib3", "discord_cli.discord_api", "PIL"]),
+    (["manage", "show-config"], ["requests", "urllib3", "discord_cli.discord_api", "PIL"]),
+    (["manage", "list-options"], ["requests", "urllib3", "discord_cli.discord_api", "PIL"]),
+    (["daemon", "status"], ["requests", "urllib3", "PIL"]),
+    # Loads the sending code, then stops: the temporary HOME has no webhooks
+    (["send", "hello"], ["PIL"]),
+]
+
+ENTRY = "from discord_cli.cli import main; main()"
+
+
+def run_scenario(argv, home):
+    """Run one invocation; returns (wall seconds, {module: cumulative us})."""
+    env = dict(os.environ, HOME=home)
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", ENTRY] + argv,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, env=env
+    )
+    elapsed = time.perf_counter() - start
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return elapsed, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Guard dc startup time against regressions.")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per scenario (default: 5)")
+    parser.add_argument("--max-import-ms", type=float, default=150.0,
+                        help="Budget for the summed self import time per invocation (default: 150)")
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as home:
+        for argv, forbidden in SCENARIOS:
+            label = "dc " + " ".join(argv)
+            walls, import_ms = [], []
+            for _ in range(args.runs):
+                elapsed, modules = run_scenario(argv, home)
+                walls.append(elapsed * 1000)
+                import_ms.append(sum(self_us for self_us, _ in modules.values()) / 1000)
+
+            leaked = [name for name in forbidden if name in modules]
+            median_import = statistics.median(import_ms)
+            print(f"{label:28} wall {statistics.median(walls):7.1f} ms   imports {median_import:7.1f} ms")
+
+            if leaked:
+                failures.append(f"{label}: imports {', '.join(leaked)}")
+            if median_import > args.max_import_ms:
+                failures.append(f"{label}: imports took {median_import:.1f} ms (budget {args.max_import_ms} ms)")
+
+    if failures:
+        print()
+        for failure in failures:
+            print(f"FAIL {failure}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Streaming tar.gz and zip archives of files and directories."""
+
+import gzip
+import os
+import tarfile
+import time
+import zipfile
+from typing import List
+
+FORMATS = ("tar.gz", "zip")
+COMPRESS_LEVEL = 6
+
+
+def archive_name(paths: List[str], archive_format: str) -> str:
+    """Name an archive after the single path it holds, or after the time."""
+    if len(paths) == 1:
+        base = os.path.basename(os.path.normpath(os.path.abspath(paths[0])))
+    else:
+        base = time.strftime("archive-%Y%m%d-%H%M%S")
+    return f"{base}.{archive_format}"
+
+
+def _walk(path: str):
+    """Yield (file path, name inside the archive) for a file or directory."""
+    top = os.path.normpath(os.path.abspath(path))
+    parent = os.path.dirname(top)
+    if not os.path.isdir(top):
+        yield top, os.path.basename(top)
+        return
+    for root, dirs, names in os.walk(top):
+        dirs.sort()
+        for name in sorted(names):
+            full = os.path.join(root, name)
+            if os.path.isfile(full):
+                yield full, os.path.relpath(full, parent)
+
+
+def write_archive(paths: List[str], archive_format: str, fileobj):
+    """Write an archive of ``paths`` to a write-only, unseekable ``fileobj``."""
+    if archive_format == "zip":
+        with zipfile.ZipFile(fileobj, "w", zipfile.ZIP_DEFLATED, compresslevel=COMPRESS_LEVEL) as zf:
+            for path in paths:
+                for full, arcname in _walk(path):
+                    zf.write(full, arcname)
+        return
+
+    with gzip.GzipFile(filename="", mode="wb", fileobj=fileobj, compresslevel=COMPRESS_LEVEL) as gz:
+        with tarfile.open(fileobj=gz, mode="w|") as tar:
+            for path in paths:
+                tar.add(path, arcname=os.path.basename(os.path.normpath(os.path.abspath(path))))
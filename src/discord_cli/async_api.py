@@ -0,0 +1,91 @@
+"""Asyncio interface to the webhook API.
+
+``AsyncWebhookClient`` exposes the message, file, embed and edit operations
+as coroutines, so callers with many sends can ``asyncio.gather`` them. The
+calls run on the transport's process-wide worker pool, and every request
+goes through the one pooled session, the rate limiter and the process-wide
+bound of ``upload_workers`` requests in flight, so several clients (or a
+client inside the daemon) never exceed it together.
+"""
+
+import asyncio
+import functools
+
+from .config import load_webhook_config
+from .discord_api import (
+    edit_message_on_discord, send_embed_to_discord, send_embeds_to_discord, send_file_to_discord,
+    send_message_to_discord,
+)
+
+
+class AsyncWebhookClient:
+    """Send to one webhook (and thread).
+
+    Use as ``async with AsyncWebhookClient(...) as client``. Every coroutine
+    returns (status_code, response_text) like its blocking counterpart.
+    ``concurrency`` optionally caps this client's sends below the
+    process-wide bound.
+    """
+
+    def __init__(self, webhook_url, thread_id=None, needs_thread=False, suffix=None, concurrency=None):
+        self.webhook_url = webhook_url
+        self.thread_id = thread_id
+        self.needs_thread = needs_thread
+        self.suffix = suffix
+        self.concurrency = concurrency
+        self._semaphore = None
+
+    @classmethod
+    def from_config(cls, suffix=None, concurrency=None):
+        """Client for the configured default webhook and thread; raises ValueError if unset."""
+        webhook_url, thread_id, needs_thread = load_webhook_config()
+        return cls(webhook_url, thread_id, needs_thread, suffix, concurrency)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Nothing to release: the worker pool is shared by the whole process."""
+
+    async def _run(self, func, *args, **kwargs):
+        # Imported here so that importing this module does not load requests
+        from .transport import executor
+
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args, **kwargs)
+        if not self.concurrency:
+            return await loop.run_in_executor(executor(), call)
+        if self._semaphore is None:
+            # Created on first use so it belongs to the running loop
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            return await loop.run_in_executor(executor(), call)
+
+    @property
+    def _target(self):
+        return self.webhook_url, self.thread_id, self.needs_thread
+
+    async def send_message(self, content, wait=False):
+        """Send a text message; with ``wait`` the response holds the created message."""
+        return await self._run(send_message_to_discord, content, *self._target, suffix=self.suffix, wait=wait)
+
+    async def send_file(self, file_path, comment=None, dedup=False):
+        """Upload a file, split into parts if it exceeds the upload limit."""
+        return await self._run(send_file_to_discord, file_path, *self._target, comment=comment,
+                               suffix=self.suffix, dedup=dedup)
+
+    async def send_embed(self, embed_data):
+        """Send a rich embed."""
+        return await self._run(send_embed_to_discord, embed_data, *self._target, suffix=self.suffix)
+
+    async def send_embeds(self, embeds, content=None, vault_posting=None):
+        """Send embeds packed into as few messages as Discord's limits allow."""
+        return await self._run(send_embeds_to_discord, embeds, *self._target, suffix=self.suffix, content=content,
+                               vault_posting=vault_posting)
+
+    async def edit_message(self, message_id, content):
+        """Replace the content of a message sent with ``send_message(wait=True)``."""
+        return await self._run(edit_message_on_discord, message_id, content, *self._target)
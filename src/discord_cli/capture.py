@@ -0,0 +1,50 @@
+"""Bounded-memory capture of command output."""
+
+import tempfile
+
+from .splitter import DISCORD_CHAR_LIMIT
+
+# The tail is only shown as a preview next to an attachment, in one message
+TAIL_CHARS = DISCORD_CHAR_LIMIT
+
+
+class OutputCapture:
+    """Write output straight to a temporary file, keeping only a preview in memory.
+
+    The first ``preview_chars`` characters are kept in RAM so short output can
+    be sent inline, and the last ``TAIL_CHARS`` so long output can show a
+    tail preview next to the attachment, however large the output grows.
+    """
+
+    interval = None
+
+    def __init__(self, header, preview_chars):
+        self.preview_chars = preview_chars
+        self.total_chars = 0
+        self.head = ""
+        self.tail = ""
+        self.file = tempfile.NamedTemporaryFile(mode="w", encoding="utf-8", suffix=".txt", delete=False)
+        self.file.write(header)
+        self.path = self.file.name
+
+    def feed(self, text):
+        """Append a chunk of output."""
+        if not text:
+            return
+        self.file.write(text)
+        self.total_chars += len(text)
+        if len(self.head) < self.preview_chars:
+            self.head += text[:self.preview_chars - len(self.head)]
+        self.tail = (self.tail + text[-TAIL_CHARS:])[-TAIL_CHARS:]
+
+    def tick(self):
+        """Nothing to do periodically; present so captures can be run like streams."""
+
+    @property
+    def complete(self) -> bool:
+        """Whether the in-memory head holds the entire output."""
+        return self.total_chars <= self.preview_chars
+
+    def close(self):
+        """Finish writing the file; its path stays valid until removed."""
+        self.file.close()
@@ -1,20 +1,13 @@
-"""Main CLI interface for Discord CLI tools."""
+"""Main CLI interface for Discord CLI tools.
+
+Subcommand modules are imported only when their subcommand runs, so that
+e.g. ``dc --version`` or ``dc manage show-config`` never load ``requests``.
+"""
 
 import argparse
 import sys
 
 from . import __version__
-from .manage import (
-    list_webhooks, add_webhook, set_default_webhook_interactive, remove_webhook,
-    list_threads, add_thread, set_default_thread_interactive, enable_thread_ids, disable_thread_ids,
-    show_username, set_username_interactive
-)
-from .config import show_config, migrate_from_env
-from .setup_wizard import quick_setup
-from .log import handle_log_command
-from .send import handle_send_command
-from .clip import handle_clip_command
-from .creds import handle_creds_command
 
 
 def create_parser():
@@ -27,8 +20,15 @@ def create_parser():
 Examples:
   dc manage add-webhook main https://discord.com/api/webhooks/...
   dc log -c "Directory listing" ls -la
+  dc log --stream nmap -sC -sV 10.10.10.5
+  gobuster dir -u http://target -w words.txt | dc log --tee -l gobuster -
   dc send report.pdf -c "Here's the report"
+  dc send screenshots/ 'loot/*.txt'
+  dc send --archive /var/www/html
   dc clip
+  dc clip --watch
+  dc creds search 10.10.10.5
+  dc flush --watch
 """
     )
     parser.add_argument('--version', action='version', version=f'%(prog)s {__version__}')
@@ -71,27 +71,64 @@ Examples:
     manage_subparsers.add_parser('show-username', help='Show current username')
     manage_subparsers.add_parser('set-username', help='Set Discord username')
 
+    # Option commands
+    manage_subparsers.add_parser('list-options', help='List tunable options')
+    set_option_parser = manage_subparsers.add_parser('set-option', help='Set a tunable option')
+    set_option_parser.add_argument('name', help='Option name (see list-options)')
+    set_option_parser.add_argument('value', help='New value')
+
     # Log subcommand
     log_parser = subparsers.add_parser('log', help='Send command output to Discord')
     log_parser.add_argument('-c', '--comment', help='Optional comment to include')
-    log_parser.add_argument('cmd_args', nargs=argparse.REMAINDER, help='The command to execute')
+    log_parser.add_argument('-s', '--stream', action='store_true',
+                            help='Stream output live by editing a Discord message while the command runs')
+    log_parser.add_argument('-t', '--tee', action='store_true', help='Also print the output to the terminal')
+    log_parser.add_argument('-l', '--label', help='Command text shown in the prompt header (useful with -)')
+    log_parser.add_argument('-F', '--force', action='store_true', help='Upload even if identical content was already posted')
+    log_parser.add_argument('cmd_args', nargs=argparse.REMAINDER,
+                            help="The command to execute, or '-' to read output from stdin")
 
     # Send subcommand
     send_parser = subparsers.add_parser('send', help='Send files to Discord')
-    send_parser.add_argument('file', help='The file to upload')
+    send_parser.add_argument('files', nargs='+', help='Files, directories or glob patterns to upload')
     send_parser.add_argument('-c', '--comment', help='Optional comment to include')
+    send_parser.add_argument('-a', '--archive', action='store_true',
+                             help='Send everything as one archive, compressed on the fly')
+    send_parser.add_argument('-f', '--format', choices=('tar.gz', 'zip'), default='tar.gz',
+                             help='Archive format (default: tar.gz)')
+    send_parser.add_argument('-F', '--force', action='store_true', help='Upload even if identical content was already posted')
 
     # Clip subcommand
-    subparsers.add_parser('clip', help='Send clipboard content to Discord')
+    clip_parser = subparsers.add_parser('clip', help='Send clipboard content to Discord')
+    clip_parser.add_argument('-w', '--watch', action='store_true', help='Keep running and post every new clipboard entry')
 
     # Creds subcommand
     creds_parser = subparsers.add_parser('creds', help='Share credentials securely with your team')
+    creds_parser.add_argument('action', nargs='?', choices=['search'], help='Search the local credential vault')
+    creds_parser.add_argument('query', nargs='?', help='Host, username, service or domain (prefix) to search for')
     creds_parser.add_argument('-u', '--username', help='Username to share')
     creds_parser.add_argument('-p', '--password', help='Password to share')
     creds_parser.add_argument('-f', '--file', help='Credential file to upload (e.g., SSH keys, credential dumps)')
     creds_parser.add_argument('-d', '--description', help='Description of the credentials')
     creds_parser.add_argument('-H', '--hostname', help='Target hostname or IP')
     creds_parser.add_argument('-s', '--service', help='Service name (e.g., SSH, HTTP, SMB)')
+    creds_parser.add_argument('-F', '--force', action='store_true', help='Upload even if identical content was already posted')
+    creds_parser.add_argument('-i', '--import', dest='import_path',
+                              help='Import every credential from a tool dump (secretsdump, potfile, NetExec, CSV; - for stdin)')
+    creds_parser.add_argument('--format', dest='import_format', default='auto',
+                              choices=['auto', 'secretsdump', 'potfile', 'nxc', 'csv'], help='Format of the --import dump')
+
+    # Flush subcommand
+    flush_parser = subparsers.add_parser('flush', help='Deliver messages queued in the outbox')
+    flush_parser.add_argument('-w', '--watch', action='store_true',
+                              help='Keep running and deliver new items as they are queued')
+    flush_parser.add_argument('-q', '--quiet', action='store_true', help='Suppress progress output')
+
+    # Daemon subcommand
+    daemon_parser = subparsers.add_parser('daemon', help='Run a background send daemon for faster dc calls')
+    daemon_parser.add_argument('action', nargs='?', default='start', choices=['start', 'stop', 'status'],
+                               help='Daemon action (default: start in the foreground)')
+    daemon_parser.add_argument('-d', '--detach', action='store_true', help='Start the daemon in the background')
 
     # Setup subcommand (alias for manage setup)
     subparsers.add_parser('setup', help='Quick setup wizard for first-time configuration')
@@ -126,9 +163,20 @@ def handle_manage_command(args):
         print("  show-username      Show current Discord username")
         print("  set-username       Set Discord username")
         print()
+        print("Options:")
+        print("  list-options       List tunable options")
+        print("  set-option         Set a tunable option")
+        print()
         print("Use 'dc manage <command> --help' for detailed help on each command.")
         return
 
+    from .manage import (
+        list_webhooks, add_webhook, set_default_webhook_interactive, remove_webhook,
+        list_threads, add_thread, set_default_thread_interactive, enable_thread_ids, disable_thread_ids,
+        show_username, set_username_interactive, list_options, set_option_value
+    )
+    from .config import show_config, migrate_from_env
+
     if args.manage_command == 'list-webhooks':
         list_webhooks()
     elif args.manage_command == 'add-webhook':
@@ -152,11 +200,16 @@ def handle_manage_command(args):
     elif args.manage_command == 'migrate':
         migrate_from_env()
     elif args.manage_command == 'setup':
+        from .setup_wizard import quick_setup
         quick_setup()
     elif args.manage_command == 'show-username':
         show_username()
     elif args.manage_command == 'set-username':
         set_username_interactive()
+    elif args.manage_command == 'list-options':
+        list_options()
+    elif args.manage_command == 'set-option':
+        set_option_value(args.name, args.value)
     else:
         print(f"Error: Unknown management command '{args.manage_command}'.")
         print("Use 'dc manage --help' for available commands.")
@@ -175,21 +228,37 @@ def main():
     if args.command == 'manage':
         handle_manage_command(args)
     elif args.command == 'log':
-        handle_log_command(args.cmd_args, args.comment)
+        from .log import handle_log_command
+        handle_log_command(args.cmd_args, args.comment, args.stream, args.tee, args.label, args.force)
     elif args.command == 'send':
-        handle_send_command(args.file, args.comment)
+        from .send import handle_send_command
+        handle_send_command(args.files, args.comment, args.archive, args.format, args.force)
     elif args.command == 'clip':
-        handle_clip_command()
+        from .clip import handle_clip_command
+        handle_clip_command(args.watch)
     elif args.command == 'creds':
+        from .creds import handle_creds_command
         handle_creds_command(
             username=args.username,
             password=args.password,
             file_path=args.file,
             description=args.description,
             hostname=args.hostname,
-            service=args.service
+            service=args.service,
+            force=args.force,
+            import_path=args.import_path,
+            import_format=args.import_format,
+            action=args.action,
+            query=args.query
         )
+    elif args.command == 'flush':
+        from .flush import handle_flush_command
+        handle_flush_command(args.watch, args.quiet)
+    elif args.command == 'daemon':
+        from .daemon import handle_daemon_command
+        handle_daemon_command(args.action, args.detach)
     elif args.command == 'setup':
+        from .setup_wizard import quick_setup
         quick_setup()
     else:
         parser.print_help()
@@ -1,30 +1,88 @@
 """Send clipboard content to Discord."""
 
+import argparse
+import functools
 import os
+import shutil
 import subprocess
 import sys
 import tempfile
+import time
+
+from .compress import maybe_compress
+from .config import get_option, load_webhook_config
+from .discord_api import send_bytes_to_discord, send_messages_to_discord, send_file_to_discord, report_result
+from .splitter import split_message
+
+# Clipboard readers: how to list the offered types, how to fetch one type, and
+# (xclip) how to ask when the owner took the selection
+TOOLS = {
+    "wl-paste": {
+        "targets": ["wl-paste", "--list-types"],
+        "text": ["wl-paste", "--no-newline"],
+        "image": ["wl-paste", "--type", "image/png"],
+    },
+    "xclip": {
+        "targets": ["xclip", "-selection", "clipboard", "-o", "-t", "TARGETS"],
+        "text": ["xclip", "-selection", "clipboard", "-o"],
+        "image": ["xclip", "-selection", "clipboard", "-t", "image/png", "-o"],
+        "stamp": ["xclip", "-selection", "clipboard", "-o", "-t", "TIMESTAMP"],
+    },
+    # xsel cannot list targets or read images
+    "xsel": {
+        "text": ["xsel", "--clipboard", "--output"],
+    },
+}
+TEXT_TARGETS = ("UTF8_STRING", "STRING", "TEXT", "text/plain", "text/plain;charset=utf-8")
+
+
+@functools.lru_cache(maxsize=None)
+def clipboard_tool():
+    """Name of the clipboard reader to use, detected once per process."""
+    candidates = ("xclip", "xsel")
+    if os.environ.get("WAYLAND_DISPLAY"):
+        candidates = ("wl-paste",) + candidates
+    for tool in candidates:
+        if shutil.which(tool):
+            return tool
+    return None
+
+
+def _run(command, text=False):
+    try:
+        return subprocess.check_output(command, stderr=subprocess.DEVNULL, text=text)
+    except (subprocess.CalledProcessError, OSError):
+        return None
 
-from .config import load_webhook_config
-from .discord_api import send_message_to_discord, send_file_to_discord
 
-DISCORD_CHAR_LIMIT = 2000
+def get_clipboard_targets():
+    """Types offered by the clipboard owner, or None if the tool cannot tell."""
+    command = TOOLS[clipboard_tool()].get("targets")
+    if not command:
+        return None
+    output = _run(command, text=True)
+    return output.split() if output else []
 
 
 def get_clipboard_text():
-    """Retrieve text content from the clipboard using xclip."""
-    try:
-        return subprocess.check_output(["xclip", "-selection", "clipboard", "-o"], text=True)
-    except subprocess.CalledProcessError:
-        return None
+    """Retrieve text content from the clipboard."""
+    return _run(TOOLS[clipboard_tool()]["text"], text=True)
 
 
 def get_clipboard_image():
-    """Check if the clipboard contains an image and return it."""
-    try:
-        return subprocess.check_output(["xclip", "-selection", "clipboard", "-t", "image/png", "-o"], stderr=subprocess.DEVNULL)
-    except subprocess.CalledProcessError:
-        return None
+    """Retrieve a PNG image from the clipboard."""
+    command = TOOLS[clipboard_tool()].get("image")
+    return _run(command) if command else None
+
+
+def get_clipboard_stamp():
+    """When the clipboard owner took the selection, or None if that is unknown.
+
+    A single cheap query that changes with every copy, so a poller only
+    fetches the content when it changed.
+    """
+    command = TOOLS[clipboard_tool()].get("stamp")
+    return (_run(command) or None) if command else None
 
 
 def is_file_path(text):
@@ -32,135 +90,96 @@ def is_file_path(text):
     return text.startswith("file://")
 
 
-def handle_clip_command():
-    """Handle clip command from CLI."""
-    try:
-        webhook_url, thread_id, needs_thread = load_webhook_config()
-    except ValueError as e:
-        print(f"Error: {e}")
-        sys.exit(1)
+def read_clipboard():
+    """Return the clipboard as ("image", png bytes), ("text", str) or (None, None).
+
+    The offered types are listed first so that only one fetch is needed.
+    """
+    if clipboard_tool() is None:
+        return None, None
+
+    targets = get_clipboard_targets()
+    if targets is not None and "image/png" in targets:
+        image_data = get_clipboard_image()
+        return ("image", image_data) if image_data else (None, None)
+    if targets is None or any(target in TEXT_TARGETS for target in targets):
+        text = get_clipboard_text()
+        return ("text", text) if text else (None, None)
+    return None, None
 
-    # Step 1: Check if the clipboard contains an image
-    image_data = get_clipboard_image()
-    if image_data:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as temp_file:
-            temp_file.write(image_data)
-            temp_file_path = temp_file.name
 
+def send_clipboard(kind, data, webhook_url, thread_id, needs_thread):
+    """Post clipboard content and report the outcome."""
+    if kind == "image":
+        filename = time.strftime("clipboard-%Y%m%d-%H%M%S.png")
+        status_code, response_text = send_bytes_to_discord(
+            data, filename, webhook_url, thread_id, needs_thread, "Sending clipboard image", "Clipboard",
+            optimize=True
+        )
+        return report_result(status_code, response_text, "Image sent successfully.", "image")
+
+    # If it's a file path, send the file
+    if is_file_path(data):
+        file_path = data.replace("file://", "").strip()
+        if not os.path.exists(file_path):
+            print(f"Error: File '{file_path}' does not exist.")
+            return False
         status_code, response_text = send_file_to_discord(
-            temp_file_path, webhook_url, thread_id, needs_thread, "Sending clipboard image", "Clipboard"
+            file_path, webhook_url, thread_id, needs_thread, None, "Clipboard"
         )
-        os.remove(temp_file_path)
-
-        if status_code in [200, 204]:
-            print("Image sent successfully.")
-        else:
-            print(f"Error sending image: {status_code} - {response_text}")
-        return
+        return report_result(status_code, response_text, "File sent successfully.", "file")
 
-    # Step 2: Check if the clipboard contains text
-    clipboard_content = get_clipboard_text()
-    if clipboard_content:
-        # If it's a file path, send the file
-        if is_file_path(clipboard_content):
-            file_path = clipboard_content.replace("file://", "").strip()
-            if os.path.exists(file_path):
-                status_code, response_text = send_file_to_discord(
-                    file_path, webhook_url, thread_id, needs_thread, None, "Clipboard"
-                )
-                if status_code in [200, 204]:
-                    print("File sent successfully.")
-                else:
-                    print(f"Error sending file: {status_code} - {response_text}")
-            else:
-                print(f"Error: File '{file_path}' does not exist.")
-            return
-
-        # If it's plain text, send it as a message or file
-        if len(clipboard_content) <= DISCORD_CHAR_LIMIT:
-            status_code, response_text = send_message_to_discord(
-                clipboard_content, webhook_url, thread_id, needs_thread, "Clipboard"
-            )
-        else:
-            with tempfile.NamedTemporaryFile(delete=False, mode="w", suffix=".txt") as temp_file:
-                temp_file.write(clipboard_content)
-                temp_file_path = temp_file.name
-
-            status_code, response_text = send_file_to_discord(
-                temp_file_path, webhook_url, thread_id, needs_thread, None, "Clipboard"
-            )
-            os.remove(temp_file_path)
-
-        if status_code in [200, 204]:
-            print("Clipboard content sent successfully.")
-        else:
-            print(f"Error sending clipboard content: {status_code} - {response_text}")
+    # If it's plain text, send it as message(s) or a file; split_max_messages 0 always attaches
+    messages = split_message(data)
+    if len(messages) <= get_option("split_max_messages"):
+        status_code, response_text = send_messages_to_discord(
+            messages, webhook_url, thread_id, needs_thread, "Clipboard"
+        )
     else:
-        print("Clipboard is empty or contains unsupported content.")
+        with tempfile.NamedTemporaryFile(delete=False, mode="w", suffix=".txt") as temp_file:
+            temp_file.write(data)
+            temp_file_path = temp_file.name
 
+        temp_file_path, _ = maybe_compress(temp_file_path, temporary=True)
+        status_code, response_text = send_file_to_discord(
+            temp_file_path, webhook_url, thread_id, needs_thread, None, "Clipboard", temporary=True
+        )
 
-def main():
-    """Main entry point for dcclip command."""
+    return report_result(status_code, response_text, "Clipboard content sent successfully.", "clipboard content")
+
+
+def handle_clip_command(watch=False):
+    """Handle clip command from CLI."""
     try:
         webhook_url, thread_id, needs_thread = load_webhook_config()
     except ValueError as e:
         print(f"Error: {e}")
         sys.exit(1)
 
-    # Step 1: Check if the clipboard contains an image
-    image_data = get_clipboard_image()
-    if image_data:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as temp_file:
-            temp_file.write(image_data)
-            temp_file_path = temp_file.name
+    if clipboard_tool() is None:
+        print("Error: No clipboard tool found. Install xclip, xsel or wl-clipboard.")
+        sys.exit(1)
 
-        status_code, response_text = send_file_to_discord(
-            temp_file_path, webhook_url, thread_id, needs_thread, "Sending clipboard image", "Clipboard"
-        )
-        os.remove(temp_file_path)
+    def send(kind, data):
+        return send_clipboard(kind, data, webhook_url, thread_id, needs_thread)
+
+    if watch:
+        # Imported here so one-shot dc clip does not pay for the watcher
+        from .clipwatch import watch_clipboard
 
-        if status_code in [200, 204]:
-            print("Image sent successfully.")
-        else:
-            print(f"Error sending image: {status_code} - {response_text}")
+        watch_clipboard(read_clipboard, send, get_clipboard_stamp)
         return
 
-    # Step 2: Check if the clipboard contains text
-    clipboard_content = get_clipboard_text()
-    if clipboard_content:
-        # If it's a file path, send the file
-        if is_file_path(clipboard_content):
-            file_path = clipboard_content.replace("file://", "").strip()
-            if os.path.exists(file_path):
-                status_code, response_text = send_file_to_discord(
-                    file_path, webhook_url, thread_id, needs_thread, None, "Clipboard"
-                )
-                if status_code in [200, 204]:
-                    print("File sent successfully.")
-                else:
-                    print(f"Error sending file: {status_code} - {response_text}")
-            else:
-                print(f"Error: File '{file_path}' does not exist.")
-            return
-
-        # If it's plain text, send it as a message or file
-        if len(clipboard_content) <= DISCORD_CHAR_LIMIT:
-            status_code, response_text = send_message_to_discord(
-                clipboard_content, webhook_url, thread_id, needs_thread, "Clipboard"
-            )
-        else:
-            with tempfile.NamedTemporaryFile(delete=False, mode="w", suffix=".txt") as temp_file:
-                temp_file.write(clipboard_content)
-                temp_file_path = temp_file.name
-
-            status_code, response_text = send_file_to_discord(
-                temp_file_path, webhook_url, thread_id, needs_thread, None, "Clipboard"
-            )
-            os.remove(temp_file_path)
-
-        if status_code in [200, 204]:
-            print("Clipboard content sent successfully.")
-        else:
-            print(f"Error sending clipboard content: {status_code} - {response_text}")
+    kind, data = read_clipboard()
+    if kind:
+        send(kind, data)
     else:
-        print("Clipboard is empty or contains unsupported content.")
\ No newline at end of file
+        print("Clipboard is empty or contains unsupported content.")
+
+
+def main():
+    """Main entry point for dcclip command."""
+    parser = argparse.ArgumentParser(description="Send clipboard content to Discord using a webhook.")
+    parser.add_argument("-w", "--watch", action="store_true", help="Keep running and post every new clipboard entry")
+    args = parser.parse_args()
+    handle_clip_command(args.watch)
@@ -0,0 +1,243 @@
+"""Watch the clipboard and post every new entry.
+
+Change notifications come from a long-running ``wl-paste --watch`` on
+Wayland, and on X11 from the X server itself: the watcher subscribes to
+XFixes selection owner events over its own display connection (through
+ctypes, no extra process), or runs ``clipnotify`` if libX11/libXfixes cannot
+be loaded. An idle watcher costs nothing. Without any of these the clipboard
+is polled every ``clip_poll_interval`` seconds; each poll only asks when the
+selection owner changed (one ``xclip -t TIMESTAMP``), and the content is
+fetched only after it did. Entries are compared by hash, and a burst of
+copies is coalesced: only content that stays unchanged for ``clip_debounce``
+seconds is posted.
+"""
+
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import selectors
+import shutil
+import subprocess
+import sys
+import time
+
+from .config import get_option
+
+
+class _ProcessNotifier:
+    """Wait for change events from a clipboard notification command.
+
+    A persistent command reports each change as a line on stdout; a one-shot
+    command (``clipnotify``) exits on the next change and is restarted.
+    """
+
+    polling = False
+
+    def __init__(self, command, persistent):
+        self.command = command
+        self.description = f"watching with {command[0]}"
+        self.persistent = persistent
+        self.selector = selectors.DefaultSelector()
+        self.process = None
+        self._start()
+
+    def _start(self):
+        if self.process:
+            self.selector.unregister(self.process.stdout)
+        self.process = subprocess.Popen(self.command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        self.selector.register(self.process.stdout, selectors.EVENT_READ)
+
+    def wait(self, timeout):
+        """Block up to ``timeout`` seconds (None: forever); True if the clipboard changed."""
+        if not self.selector.select(timeout):
+            return False
+        line = self.process.stdout.readline()
+        if self.persistent and line:
+            return True
+        if self.process.wait() != 0:
+            raise RuntimeError(f"'{self.command[0]}' failed (exit code {self.process.returncode})")
+        self._start()
+        return True
+
+    def close(self):
+        self.process.terminate()
+        self.process.wait()
+        self.selector.close()
+
+
+class _XEvent(ctypes.Structure):
+    # XEvent is a union padded to 24 longs; only the leading type is read
+    _fields_ = [("type", ctypes.c_int), ("pad", ctypes.c_long * 24)]
+
+
+class _XFixesNotifier:
+    """Wait for CLIPBOARD owner changes reported by the X server (XFixes).
+
+    The subscription lives on a display connection held by this process, so
+    waiting is a select() on its socket.
+    """
+
+    polling = False
+    description = "watching X selection events"
+    SET_SELECTION_OWNER_NOTIFY_MASK = 1
+    SELECTION_NOTIFY = 0  # XFixesSelectionNotify, relative to the event base
+
+    def __init__(self):
+        x11_path, xfixes_path = ctypes.util.find_library("X11"), ctypes.util.find_library("Xfixes")
+        if not x11_path or not xfixes_path:
+            raise OSError("libX11 or libXfixes not found")
+        x11, xfixes = ctypes.CDLL(x11_path), ctypes.CDLL(xfixes_path)
+        x11.XOpenDisplay.restype = ctypes.c_void_p
+        x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        x11.XDefaultRootWindow.restype = ctypes.c_ulong
+        x11.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        x11.XInternAtom.restype = ctypes.c_ulong
+        x11.XInternAtom.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int]
+        x11.XConnectionNumber.argtypes = [ctypes.c_void_p]
+        x11.XPending.argtypes = [ctypes.c_void_p]
+        x11.XNextEvent.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XEvent)]
+        x11.XFlush.argtypes = [ctypes.c_void_p]
+        x11.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        xfixes.XFixesQueryExtension.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int),
+                                                ctypes.POINTER(ctypes.c_int)]
+        xfixes.XFixesSelectSelectionInput.argtypes = [ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong]
+
+        display = x11.XOpenDisplay(None)
+        if not display:
+            raise OSError("cannot open the X display")
+        event_base, error_base = ctypes.c_int(), ctypes.c_int()
+        if not xfixes.XFixesQueryExtension(display, ctypes.byref(event_base), ctypes.byref(error_base)):
+            x11.XCloseDisplay(display)
+            raise OSError("the X server lacks the XFixes extension")
+
+        self.x11 = x11
+        self.display = display
+        self.event_type = event_base.value + self.SELECTION_NOTIFY
+        clipboard = x11.XInternAtom(display, b"CLIPBOARD", 0)
+        xfixes.XFixesSelectSelectionInput(display, x11.XDefaultRootWindow(display), clipboard,
+                                          self.SET_SELECTION_OWNER_NOTIFY_MASK)
+        x11.XFlush(display)
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(x11.XConnectionNumber(display), selectors.EVENT_READ)
+
+    def _drain(self):
+        """Consume queued events; True if any was a selection change."""
+        changed = False
+        event = _XEvent()
+        while self.x11.XPending(self.display):
+            self.x11.XNextEvent(self.display, ctypes.byref(event))
+            changed = changed or event.type == self.event_type
+        return changed
+
+    def wait(self, timeout):
+        """Block up to ``timeout`` seconds (None: forever); True if the clipboard changed."""
+        if self._drain():
+            return True
+        if not self.selector.select(timeout):
+            return False
+        return self._drain()
+
+    def close(self):
+        self.selector.close()
+        self.x11.XCloseDisplay(self.display)
+
+
+class _Poller:
+    """Stand-in notifier that wakes up every ``interval`` seconds.
+
+    With a ``stamp`` query (when the selection owner changed) a wakeup
+    reports a change only if the stamp moved. While no stamp is available
+    it acts as a plain poll and the caller reads the content instead.
+    """
+
+    description = "polling"
+
+    def __init__(self, interval, stamp=None):
+        self.interval = interval
+        self.stamp = stamp
+        self.last = stamp() if stamp else None
+        self.polling = self.last is None
+
+    def wait(self, timeout):
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        if not self.stamp:
+            return False
+        current = self.stamp()
+        changed = current is not None and current != self.last
+        self.polling = current is None
+        self.last = current
+        return changed
+
+    def close(self):
+        pass
+
+
+def _notifier(stamp=None):
+    """Pick the cheapest way to learn about clipboard changes."""
+    if os.environ.get("WAYLAND_DISPLAY") and shutil.which("wl-paste"):
+        return _ProcessNotifier(["wl-paste", "--watch", "echo"], persistent=True)
+    if os.environ.get("DISPLAY"):
+        try:
+            return _XFixesNotifier()
+        except (OSError, AttributeError):
+            pass
+        if shutil.which("clipnotify"):
+            return _ProcessNotifier(["clipnotify", "-s", "clipboard"], persistent=False)
+    return _Poller(get_option("clip_poll_interval"), stamp)
+
+
+def _digest(data) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8", "surrogateescape")
+    return hashlib.sha256(data).hexdigest()
+
+
+def watch_clipboard(read, send, stamp=None):
+    """Post each new clipboard entry with ``send(kind, data)`` until interrupted.
+
+    ``read()`` returns (kind, data) for the current clipboard; the optional
+    ``stamp()`` cheaply tells when it last changed (see ``_Poller``).
+    Whatever is on the clipboard when watching starts is not posted.
+    """
+    debounce = get_option("clip_debounce")
+    notifier = _notifier(stamp)
+    kind, data = read()
+    posted = seen = _digest(data) if kind else None
+    pending = None
+    deadline = None
+
+    print(f"Watching the clipboard ({notifier.description}). Press Ctrl+C to stop.")
+    try:
+        while True:
+            timeout = max(deadline - time.monotonic(), 0) if deadline else None
+            changed = notifier.wait(timeout)
+
+            if changed:
+                # Read once the burst of copies has settled
+                pending = None
+                deadline = time.monotonic() + debounce
+            elif notifier.polling:
+                kind, data = read()
+                digest = _digest(data) if kind else None
+                if digest != seen:
+                    seen = digest
+                    pending = (kind, data)
+                    deadline = time.monotonic() + debounce
+
+            if deadline and time.monotonic() >= deadline:
+                kind, data = pending if pending else read()
+                digest = _digest(data) if kind else None
+                if kind and digest != posted:
+                    send(kind, data)
+                    posted = digest
+                seen = digest
+                pending = None
+                deadline = None
+    except KeyboardInterrupt:
+        print("\nStopped watching the clipboard.")
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    finally:
+        notifier.close()
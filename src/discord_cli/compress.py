@@ -0,0 +1,67 @@
+"""Compression of large text attachments before upload.
+
+gzip is always available; zstd is used when the optional ``zstandard``
+package is installed (``pip install discord-cli[zstd]``).
+"""
+
+import gzip
+import os
+import shutil
+import tempfile
+from typing import Tuple
+
+from .config import get_option
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CHUNK_SIZE = 1024 * 1024
+EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def choose_method(size: int) -> str:
+    """Pick the compression method for an attachment of ``size`` bytes."""
+    method = get_option("compression")
+    if method == "auto":
+        if size < get_option("compress_threshold_kb") * 1024:
+            return "none"
+        return "zstd" if zstandard is not None else "gzip"
+    if method == "zstd" and zstandard is None:
+        # Configured but not installed; gzip is the portable fallback
+        return "gzip"
+    return method
+
+
+def compress_file(file_path: str, method: str) -> str:
+    """Compress ``file_path`` in fixed-size chunks; returns the new temp file path."""
+    fd, out_path = tempfile.mkstemp(suffix=f"-{os.path.basename(file_path)}{EXTENSIONS[method]}")
+
+    with open(file_path, 'rb') as src, os.fdopen(fd, 'wb') as raw_out:
+        if method == "gzip":
+            # No name or mtime in the header: identical input gives identical
+            # bytes, so the upload index recognises repeated output
+            with gzip.GzipFile(filename="", mode='wb', fileobj=raw_out, mtime=0) as out:
+                shutil.copyfileobj(src, out, CHUNK_SIZE)
+        else:
+            compressor = zstandard.ZstdCompressor(level=10, threads=-1)
+            with compressor.stream_writer(raw_out, closefd=False) as out:
+                shutil.copyfileobj(src, out, CHUNK_SIZE)
+    return out_path
+
+
+def maybe_compress(file_path: str, temporary: bool) -> Tuple[str, bool]:
+    """Compress an attachment if the configured policy asks for it.
+
+    Returns (path to upload, whether that path is temporary). A temporary
+    input is removed once its compressed copy exists.
+    """
+    method = choose_method(os.path.getsize(file_path))
+    if method == "none":
+        return file_path, temporary
+
+    compressed_path = compress_file(file_path, method)
+    if temporary:
+        os.remove(file_path)
+    return compressed_path, True
@@ -1,11 +1,50 @@
 """Configuration management for Discord CLI tools."""
 
+import copy
+import fcntl
 import json
 import os
+import tempfile
+import threading
+from contextlib import contextmanager
 from typing import Dict, Optional, Tuple
 
 
 CONFIG_PATH = os.path.expanduser("~/.config/discord-cli/config.json")
+CONFIG_LOCK_PATH = CONFIG_PATH + ".lock"
+
+# Tunable settings that can be changed with 'dc manage set-option'
+OPTION_DEFAULTS = {
+    "connect_timeout": 5.0,
+    "read_timeout": 60.0,
+    "daemon_timeout": 300.0,
+    "max_retries": 5,
+    "queue_mode": False,
+    "stream_interval": 2.0,
+    "stream_max_messages": 10,
+    "split_max_messages": 4,
+    "compression": "auto",
+    "compress_threshold_kb": 1024,
+    "upload_limit_mb": 10.0,
+    "upload_workers": 3,
+    "dedup": True,
+    "clip_poll_interval": 1.0,
+    "clip_debounce": 1.0,
+    "image_optimize": "off",
+    "image_max_dimension": 2560,
+    "image_quality": 85,
+}
+
+# Allowed values for string options
+OPTION_CHOICES = {
+    "compression": ("auto", "gzip", "zstd", "none"),
+    "image_optimize": ("off", "png", "webp", "jpeg"),
+}
+
+# Smallest allowed value for numeric options that cannot be zero
+OPTION_MINIMUMS = {
+    "upload_workers": 1,
+}
 
 
 def ensure_config_dir():
@@ -13,8 +52,84 @@ def ensure_config_dir():
     os.makedirs(os.path.dirname(CONFIG_PATH), exist_ok=True)
 
 
-def load_config():
-    """Load the JSON configuration file with all settings."""
+@contextmanager
+def locked_file(path: str, blocking: bool = True):
+    """Hold an exclusive flock on ``path``; yields False if it is busy.
+
+    The lock file itself is never replaced, so the lock stays valid while the
+    data file it protects is swapped out by an atomic rename.
+    """
+    ensure_config_dir()
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            fcntl.flock(fd, flags)
+        except BlockingIOError:
+            yield False
+            return
+        yield True
+    finally:
+        os.close(fd)
+
+
+class Config:
+    """Read-only view of a parsed configuration with typed accessors."""
+
+    def __init__(self, data: Dict):
+        self._data = data
+
+    @property
+    def webhooks(self) -> Dict[str, str]:
+        return self._data["webhooks"]
+
+    @property
+    def threads(self) -> Dict[str, str]:
+        return self._data["threads"]
+
+    @property
+    def settings(self) -> Dict:
+        return self._data["settings"]
+
+    @property
+    def default_webhook(self) -> Optional[str]:
+        """URL of the default webhook, if one is set."""
+        return self.webhooks.get(self.settings.get("default_webhook") or "")
+
+    @property
+    def default_thread(self) -> Optional[str]:
+        """ID of the default thread, if one is set."""
+        return self.threads.get(self.settings.get("default_thread") or "")
+
+    @property
+    def use_threads(self) -> bool:
+        return bool(self.settings.get("use_threads", False))
+
+    @property
+    def username(self) -> str:
+        return self.settings.get("username", "Yeeb")
+
+    def option(self, name: str):
+        """Get a tunable option, falling back to its default."""
+        return self.settings.get(name, OPTION_DEFAULTS[name])
+
+
+_cache_lock = threading.Lock()
+_cached_stamp = None
+_cached_data = None
+
+
+def _file_stamp():
+    """Identify the config file's current version without reading it."""
+    try:
+        st = os.stat(CONFIG_PATH)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _parse_config() -> Dict:
+    """Read and normalize the JSON configuration file."""
     if not os.path.exists(CONFIG_PATH):
         return {
             "webhooks": {},
@@ -50,86 +165,184 @@ def load_config():
     return config
 
 
+def _cached_config() -> Dict:
+    """Return the parsed config, re-parsing only when the file changed.
+
+    The file is identified by inode, mtime and size, so long-running modes
+    (daemon, flush --watch) pick up edits made by other dc processes while a
+    burst of sends costs a single stat per lookup.
+    """
+    global _cached_stamp, _cached_data
+    stamp = _file_stamp()
+    with _cache_lock:
+        if _cached_data is None or stamp != _cached_stamp:
+            _cached_data = _parse_config()
+            _cached_stamp = stamp
+        return _cached_data
+
+
+def get_config() -> Config:
+    """Get the cached configuration. Treat it as read-only."""
+    return Config(_cached_config())
+
+
+def load_config():
+    """Load the JSON configuration file with all settings.
+
+    Returns a private copy that callers may modify and pass to save_config.
+    """
+    return copy.deepcopy(_cached_config())
+
+
+def _write_config(config):
+    """Write the config atomically: readers see either the old or new file."""
+    global _cached_stamp, _cached_data
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(CONFIG_PATH), prefix=".config-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(config, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, CONFIG_PATH)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    with _cache_lock:
+        _cached_data = copy.deepcopy(config)
+        _cached_stamp = _file_stamp()
+
+
 def save_config(config):
-    """Save configuration to JSON file."""
+    """Save configuration to JSON file.
+
+    Prefer config_transaction() for read-modify-write updates; this
+    overwrites whatever other processes saved since ``config`` was loaded.
+    """
     ensure_config_dir()
-    with open(CONFIG_PATH, 'w') as f:
-        json.dump(config, f, indent=4)
+    with locked_file(CONFIG_LOCK_PATH):
+        _write_config(config)
+
+
+@contextmanager
+def config_transaction():
+    """Read-modify-write the config under an exclusive file lock.
+
+    Yields a fresh copy of the config; it is written back atomically when the
+    block exits without an exception. Concurrent dc processes serialize on
+    the lock, so no update is lost.
+    """
+    with locked_file(CONFIG_LOCK_PATH):
+        config = _parse_config()
+        yield config
+        _write_config(config)
 
 
 def get_default_webhook() -> Optional[str]:
     """Get the default webhook URL."""
-    config = load_config()
-    default_name = config["settings"].get("default_webhook")
-    if default_name and default_name in config["webhooks"]:
-        return config["webhooks"][default_name]
-    return None
+    return get_config().default_webhook
 
 
 def get_default_thread() -> Optional[str]:
     """Get the default thread ID."""
-    config = load_config()
-    default_name = config["settings"].get("default_thread")
-    if default_name and default_name in config["threads"]:
-        return config["threads"][default_name]
-    return None
+    return get_config().default_thread
 
 
 def get_use_threads() -> bool:
     """Check if threads are enabled."""
-    config = load_config()
-    return config["settings"].get("use_threads", False)
+    return get_config().use_threads
 
 
 def set_default_webhook(webhook_name: str):
     """Set the default webhook."""
-    config = load_config()
-    if webhook_name in config["webhooks"]:
+    with config_transaction() as config:
+        if webhook_name not in config["webhooks"]:
+            return False
         config["settings"]["default_webhook"] = webhook_name
-        save_config(config)
-        return True
-    return False
+    return True
 
 
 def set_default_thread(thread_name: str):
     """Set the default thread."""
-    config = load_config()
-    if thread_name in config["threads"]:
+    with config_transaction() as config:
+        if thread_name not in config["threads"]:
+            return False
         config["settings"]["default_thread"] = thread_name
-        save_config(config)
-        return True
-    return False
+    return True
 
 
 def set_use_threads(enabled: bool):
     """Enable or disable thread usage."""
-    config = load_config()
-    config["settings"]["use_threads"] = enabled
-    save_config(config)
+    with config_transaction() as config:
+        config["settings"]["use_threads"] = enabled
 
 
 def get_username() -> str:
     """Get the configured username."""
-    config = load_config()
-    return config["settings"].get("username", "Yeeb")
+    return get_config().username
 
 
 def set_username(username: str):
     """Set the username."""
-    config = load_config()
-    config["settings"]["username"] = username
-    save_config(config)
+    with config_transaction() as config:
+        config["settings"]["username"] = username
+
+
+def get_option(name: str):
+    """Get a tunable option, falling back to its default."""
+    return get_config().option(name)
+
+
+def set_option(name: str, value):
+    """Set a tunable option."""
+    with config_transaction() as config:
+        config["settings"][name] = value
+
+
+def parse_option_value(name: str, raw: str):
+    """Convert a raw command line value to the type of the option's default."""
+    if name not in OPTION_DEFAULTS:
+        raise ValueError(f"Unknown option '{name}'. Available: {', '.join(sorted(OPTION_DEFAULTS))}")
+
+    default = OPTION_DEFAULTS[name]
+    if isinstance(default, bool):
+        lowered = raw.strip().lower()
+        if lowered in ("1", "true", "yes", "on"):
+            return True
+        if lowered in ("0", "false", "no", "off"):
+            return False
+        raise ValueError(f"Option '{name}' expects true or false")
+    if isinstance(default, (int, float)):
+        try:
+            value = type(default)(raw)
+        except ValueError:
+            raise ValueError(f"Option '{name}' expects a number") from None
+        if value < 0 or (isinstance(default, float) and value == 0):
+            raise ValueError(f"Option '{name}' must be positive")
+        if value < OPTION_MINIMUMS.get(name, 0):
+            raise ValueError(f"Option '{name}' must be at least {OPTION_MINIMUMS[name]}")
+        return value
+    if name in OPTION_CHOICES and raw not in OPTION_CHOICES[name]:
+        raise ValueError(f"Option '{name}' expects one of: {', '.join(OPTION_CHOICES[name])}")
+    return raw
+
+
+def get_timeouts() -> Tuple[float, float]:
+    """Get the (connect, read) HTTP timeouts in seconds."""
+    config = get_config()
+    return config.option("connect_timeout"), config.option("read_timeout")
 
 
 def load_webhook_config() -> Tuple[str, Optional[str], bool]:
     """Load webhook configuration from config file."""
-    webhook_url = get_default_webhook()
-    thread_id = get_default_thread()
-    needs_thread = get_use_threads()
+    config = get_config()
+    webhook_url = config.default_webhook
+    thread_id = config.default_thread
+    needs_thread = config.use_threads
 
     if not webhook_url:
-        config = load_config()
-        if not config["webhooks"]:
+        if not config.webhooks:
             # No webhooks configured at all - suggest setup
             raise ValueError(
                 "No webhooks configured. Run 'dc setup' for quick configuration, "
@@ -150,13 +363,14 @@ def migrate_from_env():
     if not os.path.exists(env_path):
         return
 
-    config = load_config()
     migrated = False
 
     try:
         with open(env_path, 'r') as f:
-            for line in f:
-                line = line.strip()
+            lines = [line.strip() for line in f]
+
+        with config_transaction() as config:
+            for line in lines:
                 if line.startswith("export DISCORD_WEBHOOK_URL="):
                     webhook_url = line.split("=", 1)[1].strip("'\"")
                     if webhook_url and "migrated" not in config["webhooks"]:
@@ -177,7 +391,6 @@ def migrate_from_env():
                     migrated = True
 
         if migrated:
-            save_config(config)
             print("Migrated configuration from .env file to ~/.config/discord-cli/config.json")
             print("You can now remove the Discord-related entries from ~/.env")
 
@@ -233,6 +446,9 @@ def show_config():
     print(f"  📡 Default webhook: {default_webhook or 'None'}")
     print(f"  🧵 Default thread: {default_thread or 'None'}")
     print(f"  🔧 Thread usage: {'Enabled' if use_threads else 'Disabled'}")
+    for name in sorted(OPTION_DEFAULTS):
+        value = config["settings"].get(name, OPTION_DEFAULTS[name])
+        print(f"  🔸 {name}: {value}")
 
     print("=" * 80)
 
@@ -4,10 +4,14 @@ import argparse
 import os
 import sys
 import tempfile
+import time
 from typing import Optional
 
-from .config import load_webhook_config
-from .discord_api import send_embed_to_discord, send_file_to_discord, send_message_to_discord
+from .config import get_option, load_webhook_config
+from .discord_api import (
+    send_embed_to_discord, send_embeds_to_discord, send_file_to_discord, send_message_to_discord, report_result,
+    SUCCESS_CODES, STATUS_QUEUED
+)
 
 
 def create_creds_embed(username: str = None, password: str = None, description: str = None,
@@ -138,17 +142,140 @@ def create_ssh_key_embed(key_content: str, filename: str, hostname: str = None,
     return embed
 
 
+def import_credentials(import_path: str, file_format: str, webhook_url, thread_id, needs_thread,
+                       description: str = None, hostname: str = None, service: str = None, force: bool = False):
+    """Post every credential found in a tool dump, packed into as few messages as possible.
+
+    Credentials already posted to this webhook/thread are skipped unless
+    ``force`` is set; everything posted is stored in the local vault once
+    Discord has it, so queued messages are stored when they are delivered.
+    """
+    # Imported here so single credential shares do not load the parsers
+    import asyncio
+
+    from . import vault
+    from .async_api import AsyncWebhookClient
+    from .creds_import import credential_field, pack_embeds, read_credentials
+
+    if import_path == "-":
+        stream, source = sys.stdin.buffer, "stdin"
+    else:
+        if not os.path.exists(import_path):
+            print(f"Error: File '{import_path}' does not exist.")
+            sys.exit(1)
+        stream, source = open(import_path, 'rb'), os.path.basename(import_path)
+
+    destination = thread_id if needs_thread else None
+    count, new = [0], [0]
+    pending = []
+
+    def parsed():
+        for cred in read_credentials(stream, source, file_format):
+            count[0] += 1
+            yield cred._replace(host=cred.host or hostname, service=cred.service or service)
+
+    def fields():
+        creds = parsed()
+        if get_option("dedup") and not force:
+            creds = vault.unposted(creds, webhook_url, destination)
+        for cred in creds:
+            new[0] += 1
+            pending.append(cred)
+            yield credential_field(cred)
+
+    counts = {"posted": 0, "sent": 0, "failed": 0}
+
+    def done(status_code, response_text, batch):
+        if status_code in SUCCESS_CODES or status_code == STATUS_QUEUED:
+            counts["sent"] += 1
+            counts["posted"] += len(batch)
+        else:
+            counts["failed"] += 1
+            print(f"Error sending credentials: {status_code} - {response_text}")
+
+    async def post_all():
+        # The first message carries the description and goes out alone; after
+        # it, up to upload_workers messages are in flight at once
+        in_flight = {}
+        async with AsyncWebhookClient(webhook_url, thread_id, needs_thread, "Credentials") as client:
+            for embeds in pack_embeds(fields(), f"🔐 Imported credentials ({source})"):
+                # The packer reads one field ahead, so only the first ones belong to this message
+                batch_size = sum(len(embed["fields"]) for embed in embeds)
+                batch, pending[:batch_size] = pending[:batch_size], []
+                posting = vault.posting(batch, description, source)
+                if not counts["sent"] and not counts["failed"]:
+                    done(*await client.send_embeds(embeds, description, posting), batch)
+                    continue
+                in_flight[asyncio.ensure_future(client.send_embeds(embeds, vault_posting=posting))] = batch
+                if len(in_flight) >= max(get_option("upload_workers"), 1):
+                    finished, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    for task in finished:
+                        done(*task.result(), in_flight.pop(task))
+            for task in list(in_flight):
+                done(*await task, in_flight.pop(task))
+
+    try:
+        asyncio.run(post_all())
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+
+    posted, sent, failed = counts["posted"], counts["sent"], counts["failed"]
+    if not count[0]:
+        print(f"No credentials found in {source}.")
+        return
+    skipped = count[0] - new[0]
+    if not new[0]:
+        print(f"All {count[0]} credentials from {source} were already posted (use -F to post them again).")
+        return
+    print(f"Imported {posted} credentials from {source} in {sent + failed} messages"
+          + (f", {failed} failed" if failed else "")
+          + (f", {skipped} already posted or repeated were skipped." if skipped else "."))
+
+
+def search_credentials(query: str = None, hostname: str = None, service: str = None, username: str = None):
+    """Print the credentials in the local vault that match."""
+    from . import vault
+
+    rows = vault.search(query, hostname, service, username)
+    if not rows:
+        print("No stored credentials match.")
+        return
+
+    table = []
+    for row in rows:
+        account = f"{row['domain']}\\{row['username']}" if row["domain"] else row["username"]
+        posted = time.strftime("%Y-%m-%d %H:%M", time.localtime(row["created"]))
+        table.append((row["host"] or "-", row["service"] or "-", account or "-", row["kind"], row["secret"], posted))
+    widths = [min(max(len(line[column]) for line in table), 40) for column in range(4)]
+    for line in table:
+        print("  ".join(value.ljust(width) for value, width in zip(line, widths)) + f"  {line[4]}  ({line[5]})")
+    print(f"\n{len(rows)} credential{'s' if len(rows) != 1 else ''} found.")
+
+
 def handle_creds_command(username: str = None, password: str = None, file_path: str = None,
-                        description: str = None, hostname: str = None, service: str = None):
+                        description: str = None, hostname: str = None, service: str = None,
+                        force: bool = False, import_path: str = None, import_format: str = "auto",
+                        action: str = None, query: str = None):
     """Handle credentials sharing command."""
+    if action == "search":
+        search_credentials(query, hostname, service, username)
+        return
+
     # Show help if no arguments provided
-    if not username and not password and not file_path and not description and not hostname and not service:
+    if (not username and not password and not file_path and not import_path and not description
+            and not hostname and not service):
         print("dc creds - Share credentials securely with your team via Discord")
         print()
         print("Usage:")
         print("  dc creds -u USERNAME -p PASSWORD [-H hostname] [-s service] [-d description]")
         print("  dc creds -f FILE [-H hostname] [-s service] [-d description]")
         print("  dc creds -u USERNAME [-H hostname] [-s service] [-d description]")
+        print("  dc creds -i DUMP [--format FORMAT] [-H hostname] [-s service] [-d description]")
+        print("  dc creds search [QUERY] [-H hostname] [-s service] [-u username]")
         print()
         print("Options:")
         print("  -u, --username     Username to share")
@@ -157,12 +284,17 @@ def handle_creds_command(username: str = None, password: str = None, file_path:
         print("  -d, --description  Description of the credentials")
         print("  -H, --hostname     Target hostname or IP")
         print("  -s, --service      Service name (e.g., SSH, HTTP, SMB)")
+        print("  -F, --force        Post even if the file or credentials were already posted")
+        print("  -i, --import       Import every credential from a tool dump (- for stdin)")
+        print("      --format       Dump format: auto, secretsdump, potfile, nxc, csv")
         print()
         print("Examples:")
         print("  dc creds -u admin -p password123 -H 10.10.10.1")
         print("  dc creds -u root -p toor -s SSH -d \"Root access to target\"")
         print("  dc creds -f id_rsa -H target.example.com -s SSH")
         print("  dc creds -f creds.txt -d \"Found in /etc/passwd\"")
+        print("  dc creds -i secretsdump.txt -H dc01.corp.local")
+        print("  dc creds search 10.10.10.5")
         return
 
     try:
@@ -171,6 +303,11 @@ def handle_creds_command(username: str = None, password: str = None, file_path:
         print(f"Error: {e}")
         sys.exit(1)
 
+    if import_path:
+        import_credentials(import_path, import_format, webhook_url, thread_id, needs_thread,
+                           description, hostname, service, force)
+        return
+
     # Validate that we have some credentials to share
     if not username and not password and not file_path:
         print("Error: Must provide username, password, or file to share credentials.")
@@ -216,10 +353,8 @@ def handle_creds_command(username: str = None, password: str = None, file_path:
                     embed, webhook_url, thread_id, needs_thread, "Credentials"
                 )
 
-                if status_code in [200, 204]:
-                    print(f"SSH key '{filename}' shared successfully as text.")
-                else:
-                    print(f"Error sending SSH key: {status_code} - {response_text}")
+                report_result(status_code, response_text,
+                              f"SSH key '{filename}' shared successfully as text.", "SSH key")
                 return
 
         except UnicodeDecodeError:
@@ -233,28 +368,27 @@ def handle_creds_command(username: str = None, password: str = None, file_path:
             service=service
         )
 
-        # Send embed first
-        status_code, response_text = send_embed_to_discord(
-            embed, webhook_url, thread_id, needs_thread, "Credentials"
-        )
-
-        if status_code not in [200, 204]:
-            print(f"Error sending credential embed: {status_code} - {response_text}")
-            return
-
-        # Then send the file
+        # The embed and the file go out as one message
         status_code, response_text = send_file_to_discord(
             file_path, webhook_url, thread_id, needs_thread,
-            f"🔐 Credential file: {filename}", "Credentials"
+            f"🔐 Credential file: {filename}", "Credentials", dedup=not force, embeds=[embed]
         )
 
-        if status_code in [200, 204]:
-            print(f"Credential file '{file_path}' shared successfully.")
-        else:
-            print(f"Error sending credential file: {status_code} - {response_text}")
+        report_result(status_code, response_text,
+                      f"Credential file '{file_path}' shared successfully.", "credential file")
 
     else:
-        # Handle username/password sharing
+        # Handle username/password sharing; the vault (and sqlite3) is only loaded here
+        from . import vault
+
+        cred = vault.Credential(username or "", password or "", "password", hostname, service)
+        destination = thread_id if needs_thread else None
+        posted_on = vault.posted_on(cred, webhook_url, destination) if get_option("dedup") and not force else None
+        if posted_on:
+            posted = time.strftime("%Y-%m-%d %H:%M", time.localtime(posted_on))
+            print(f"These credentials were already posted on {posted} (use -F to post them again).")
+            return
+
         embed = create_creds_embed(
             username=username,
             password=password,
@@ -263,19 +397,19 @@ def handle_creds_command(username: str = None, password: str = None, file_path:
             service=service
         )
 
-        status_code, response_text = send_embed_to_discord(
-            embed, webhook_url, thread_id, needs_thread, "Credentials"
+        # Stored in the vault once delivered, which may be later if it gets queued
+        status_code, response_text = send_embeds_to_discord(
+            [embed], webhook_url, thread_id, needs_thread, "Credentials",
+            vault_posting=vault.posting([cred], description)
         )
 
-        if status_code in [200, 204]:
-            cred_types = []
-            if username:
-                cred_types.append("username")
-            if password:
-                cred_types.append("password")
-            print(f"Credentials ({', '.join(cred_types)}) shared successfully.")
-        else:
-            print(f"Error sending credentials: {status_code} - {response_text}")
+        cred_types = []
+        if username:
+            cred_types.append("username")
+        if password:
+            cred_types.append("password")
+        report_result(status_code, response_text,
+                      f"Credentials ({', '.join(cred_types)}) shared successfully.", "credentials")
 
 
 def main():
@@ -289,15 +423,25 @@ Examples:
   dc creds -u root -p toor -s SSH -d "Root access to target"
   dc creds -f id_rsa -H target.example.com -s SSH
   dc creds -f creds.txt -d "Found in /etc/passwd"
+  dc creds -i secretsdump.txt -H dc01.corp.local
+  dc creds search 10.10.10.5
 """
     )
 
+    parser.add_argument('action', nargs='?', choices=['search'], help='Search the local credential vault')
+    parser.add_argument('query', nargs='?', help='Host, username, service or domain (prefix) to search for')
+
     parser.add_argument('-u', '--username', help='Username to share')
     parser.add_argument('-p', '--password', help='Password to share')
     parser.add_argument('-f', '--file', help='Credential file to upload (e.g., SSH keys, credential dumps)')
     parser.add_argument('-d', '--description', help='Description of the credentials')
     parser.add_argument('-H', '--hostname', help='Target hostname or IP')
     parser.add_argument('-s', '--service', help='Service name (e.g., SSH, HTTP, SMB)')
+    parser.add_argument('-F', '--force', action='store_true', help='Upload even if identical content was already posted')
+    parser.add_argument('-i', '--import', dest='import_path',
+                        help='Import every credential from a tool dump (secretsdump, potfile, NetExec, CSV; - for stdin)')
+    parser.add_argument('--format', dest='import_format', default='auto',
+                        choices=['auto', 'secretsdump', 'potfile', 'nxc', 'csv'], help='Format of the --import dump')
 
     args = parser.parse_args()
 
@@ -307,7 +451,12 @@ Examples:
         file_path=args.file,
         description=args.description,
         hostname=args.hostname,
-        service=args.service
+        service=args.service,
+        force=args.force,
+        import_path=args.import_path,
+        import_format=args.import_format,
+        action=args.action,
+        query=args.query
     )
 
 
@@ -0,0 +1,234 @@
+"""Bulk import of credentials from tool output.
+
+Parsers read their input line by line and yield ``Credential`` records, so
+dumps of any size are processed in constant memory. Supported formats:
+impacket secretsdump, hashcat/john potfiles, NetExec (nxc/crackmapexec)
+output and CSV with a header row.
+"""
+
+import codecs
+import csv
+import itertools
+import re
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .embeds import MAX_EMBED_CHARS, MAX_EMBEDS, MAX_FIELD_NAME, MAX_FIELD_VALUE, MAX_FIELDS
+from .vault import Credential
+
+FORMATS = ("auto", "secretsdump", "potfile", "nxc", "csv")
+
+EMBED_COLOR = 15158332  # Same red as single credential shares
+
+
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*m")
+SECRETSDUMP_HASH = re.compile(
+    r"^(?P<user>[^:\s]+):(?P<rid>\d+):(?P<lm>[0-9a-fA-F]{32}):(?P<nt>[0-9a-fA-F]{32}):::"
+)
+SECRETSDUMP_CLEARTEXT = re.compile(r"^(?P<user>[^:\s]+):CLEARTEXT:(?P<password>.*)$")
+SECRETSDUMP_KERBEROS = re.compile(r"^(?P<user>[^:\s]+):(?P<type>aes\d+-cts-hmac-sha1-96|des-cbc-md5):(?P<key>[0-9a-fA-F]+)$")
+NXC_LINE = re.compile(r"^(?P<proto>[A-Z0-9]+)\s+(?P<host>\S+)\s+(?P<port>\d+)\s+(?P<name>\S+)\s+(?P<rest>.*)$")
+NXC_SUCCESS = re.compile(r"^\[\+\]\s+(?P<account>[^\s:]+):(?P<secret>.+?)(?:\s+\([^)]*\))?$")
+HEX_PLAIN = re.compile(r"^\$HEX\[(?P<hex>[0-9a-fA-F]*)\]$")
+PLAIN_HASH = re.compile(r"^[0-9a-fA-F]{16,128}:")
+KERBEROS_HASH_USER = re.compile(r"^\$krb5(?:tgs|asrep)\$(?:\d+\$)?\*?(?P<user>[^$*:]+)")
+
+CSV_COLUMNS = {
+    "username": ("username", "user", "login", "account"),
+    "secret": ("password", "pass", "secret", "hash", "ntlm"),
+    "host": ("host", "hostname", "ip", "target", "address"),
+    "service": ("service", "protocol", "proto"),
+    "domain": ("domain", "realm"),
+}
+
+
+def _split_account(account: str):
+    """Split DOMAIN\\user or user@domain into (domain, user)."""
+    if "\\" in account:
+        domain, user = account.split("\\", 1)
+        return domain or None, user
+    if "@" in account:
+        user, domain = account.rsplit("@", 1)
+        return domain or None, user
+    return None, account
+
+
+def _secretsdump_record(line: str, host=None, service=None) -> Optional[Credential]:
+    match = SECRETSDUMP_HASH.match(line)
+    if match:
+        domain, user = _split_account(match["user"])
+        return Credential(user, f"{match['lm']}:{match['nt']}", "NTLM", host, service, domain)
+    match = SECRETSDUMP_CLEARTEXT.match(line)
+    if match:
+        domain, user = _split_account(match["user"])
+        return Credential(user, match["password"], "password", host, service, domain)
+    match = SECRETSDUMP_KERBEROS.match(line)
+    if match:
+        domain, user = _split_account(match["user"])
+        return Credential(user, match["key"], match["type"], host, service, domain)
+    return None
+
+
+def parse_secretsdump(lines: Iterable[str]) -> Iterator[Credential]:
+    """impacket-secretsdump: SAM/NTDS hashes, cleartext and Kerberos keys."""
+    for line in lines:
+        record = _secretsdump_record(line.strip())
+        if record:
+            yield record
+
+
+def _decode_plain(plain: str) -> str:
+    match = HEX_PLAIN.match(plain)
+    if match:
+        return bytes.fromhex(match["hex"]).decode("utf-8", "replace")
+    return plain
+
+
+def parse_potfile(lines: Iterable[str]) -> Iterator[Credential]:
+    """hashcat/john potfiles: ``hash:plaintext`` per line."""
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if ":" not in line:
+            continue
+        # Bare hex hashes never contain a colon, so the plaintext may;
+        # structured hashes (NetNTLM, Kerberos) do, so split at the last one
+        if PLAIN_HASH.match(line):
+            hash_value, plain = line.split(":", 1)
+        else:
+            hash_value, plain = line.rsplit(":", 1)
+
+        username, domain = "", None
+        if "::" in hash_value:
+            # NetNTLMv1/v2: user::DOMAIN:challenge:...
+            username, rest = hash_value.split("::", 1)
+            domain = rest.split(":", 1)[0] or None
+        else:
+            match = KERBEROS_HASH_USER.match(hash_value)
+            if match:
+                domain, username = _split_account(match["user"])
+        yield Credential(username or hash_value[:32], _decode_plain(plain), "password", domain=domain)
+
+
+def parse_nxc(lines: Iterable[str]) -> Iterator[Credential]:
+    """NetExec/CrackMapExec: successful logins and dumped hashes."""
+    for line in lines:
+        match = NXC_LINE.match(ANSI_ESCAPE.sub("", line).strip())
+        if not match:
+            continue
+        host, service, rest = match["host"], match["proto"], match["rest"].strip()
+        success = NXC_SUCCESS.match(rest)
+        if success:
+            domain, user = _split_account(success["account"])
+            secret = success["secret"]
+            kind = "NTLM" if re.fullmatch(r"(?:[0-9a-fA-F]{32}:)?[0-9a-fA-F]{32}", secret) else "password"
+            yield Credential(user, secret, kind, host, service, domain)
+            continue
+        record = _secretsdump_record(rest, host, service)
+        if record:
+            yield record
+
+
+def parse_csv(lines: Iterable[str]) -> Iterator[Credential]:
+    """CSV with a header row naming at least a username or secret column."""
+    reader = csv.DictReader(lines)
+    columns = {}
+    for field, names in CSV_COLUMNS.items():
+        for name in reader.fieldnames or ():
+            if name and name.strip().lower() in names:
+                columns[field] = name
+                break
+    if "username" not in columns and "secret" not in columns:
+        raise ValueError("CSV needs a header with a username or password column")
+
+    for row in reader:
+        values = {field: (row.get(name) or "").strip() for field, name in columns.items()}
+        if not values.get("username") and not values.get("secret"):
+            continue
+        yield Credential(values.get("username", ""), values.get("secret", ""), "password",
+                         values.get("host") or None, values.get("service") or None, values.get("domain") or None)
+
+
+PARSERS = {
+    "secretsdump": parse_secretsdump,
+    "potfile": parse_potfile,
+    "nxc": parse_nxc,
+    "csv": parse_csv,
+}
+
+
+def detect_format(filename: str, first_lines: List[str]) -> str:
+    """Guess the dump format from the file name and its first lines."""
+    lowered = filename.lower()
+    if lowered.endswith(".csv"):
+        return "csv"
+    if lowered.endswith((".pot", ".potfile")):
+        return "potfile"
+    for line in first_lines:
+        clean = ANSI_ESCAPE.sub("", line).strip()
+        if NXC_LINE.match(clean) and clean.split()[0] in ("SMB", "LDAP", "WINRM", "MSSQL", "SSH", "RDP", "FTP",
+                                                          "WMI", "VNC", "NFS"):
+            return "nxc"
+        if _secretsdump_record(clean) or clean.startswith("[*] Dumping"):
+            return "secretsdump"
+    return "potfile"
+
+
+def read_credentials(stream, filename: str, file_format: str = "auto") -> Iterator[Credential]:
+    """Parse credentials from a binary stream, decoding it incrementally."""
+    lines = codecs.getreader("utf-8")(stream, errors="replace")
+    if file_format == "auto":
+        head = []
+        for line in lines:
+            head.append(line)
+            if len(head) == 20:
+                break
+        file_format = detect_format(filename, head)
+        lines = itertools.chain(head, lines)
+    return PARSERS[file_format](lines)
+
+
+def credential_field(cred: Credential, host=None, service=None) -> Dict:
+    """Render one credential as an embed field."""
+    account = f"{cred.domain}\\{cred.username}" if cred.domain else cred.username
+    where = " · ".join(part for part in (cred.host or host, cred.service or service) if part)
+    name = f"👤 {account or '(no username)'}" + (f" @ {where}" if where else "")
+    label = "" if cred.kind == "password" else f"{cred.kind}\n"
+    value = f"```\n{label}{cred.secret}\n```"
+    if len(value) > MAX_FIELD_VALUE:
+        value = value[:MAX_FIELD_VALUE - 8] + "…\n```"
+    return {"name": name[:MAX_FIELD_NAME], "value": value, "inline": False}
+
+
+def _field_size(field: Dict) -> int:
+    return len(field["name"]) + len(field["value"])
+
+
+def pack_embeds(fields: Iterable[Dict], title: str) -> Iterator[List[Dict]]:
+    """Pack fields into embeds, and embeds into messages, within Discord's limits.
+
+    Yields one list of embeds per message: at most 10 embeds, 25 fields per
+    embed and 6000 characters over all embeds of the message. Filling each
+    message field by field packs tighter than ``embeds.batch_embeds``, which
+    can only group whole embeds.
+    """
+    message: List[Dict] = []
+    message_chars = 0
+    embed = None
+
+    for field in fields:
+        size = _field_size(field)
+        embed_full = embed is None or len(embed["fields"]) == MAX_FIELDS
+        needs_title = len(title) if embed_full else 0
+        if message_chars + needs_title + size > MAX_EMBED_CHARS or (embed_full and len(message) == MAX_EMBEDS):
+            if message:
+                yield message
+            message, message_chars, embed = [], 0, None
+            embed_full, needs_title = True, len(title)
+        if embed_full:
+            embed = {"title": title, "color": EMBED_COLOR, "fields": []}
+            message.append(embed)
+            message_chars += needs_title
+        embed["fields"].append(field)
+        message_chars += size
+
+    if message:
+        yield message
@@ -0,0 +1,206 @@
+"""Long-running send daemon reachable over a local Unix socket.
+
+While ``dc daemon`` runs, the ``dc`` front-end hands every payload to it
+instead of sending it itself, so short-lived invocations skip importing
+``requests`` and reuse the daemon's warm connection pool.
+
+Protocol: the client sends one JSON object per line,
+``{"op": "send", "kind": ..., "payload": {...}, "temporary": bool}`` or
+``{"op": "ping"}`` / ``{"op": "shutdown"}``, and receives one JSON line
+``{"status": int, "text": str}`` in reply.
+"""
+
+import json
+import os
+import queue
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+from typing import Dict, Optional, Tuple
+
+from .config import CONFIG_PATH, ensure_config_dir, get_option
+
+SOCKET_PATH = os.path.join(os.path.dirname(CONFIG_PATH), "daemon.sock")
+CONNECT_TIMEOUT = 0.5
+
+# Set in the daemon process so senders there never forward to themselves
+_serving = False
+
+
+def _request(message: Dict, timeout: Optional[float] = None) -> Optional[Dict]:
+    """Send one request to the daemon; returns None if it is not reachable.
+
+    A daemon that does not answer within ``timeout`` seconds, or whose reply
+    is cut short or malformed, counts as unreachable too.
+    """
+    if not os.path.exists(SOCKET_PATH):
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(SOCKET_PATH)
+        sock.settimeout(timeout)
+        sock.sendall(json.dumps(message).encode() + b"\n")
+        with sock.makefile('rb') as reply:
+            line = reply.readline()
+    except OSError:
+        return None
+    finally:
+        sock.close()
+
+    try:
+        reply = json.loads(line)
+    except ValueError:
+        return None
+    return reply if isinstance(reply, dict) else None
+
+
+def forward(kind: str, payload: Dict, temporary: bool = False) -> Optional[Tuple[int, str]]:
+    """Hand a payload to a running daemon.
+
+    Returns the daemon's (status_code, response_text), or None when no daemon
+    is running and the caller should send the payload itself.
+    """
+    if _serving:
+        return None
+    # The daemon answers once it has sent the payload, which can take a while
+    # for large uploads; only a daemon silent for daemon_timeout is given up on
+    reply = _request({"op": "send", "kind": kind, "payload": payload, "temporary": temporary},
+                     timeout=get_option("daemon_timeout"))
+    if reply is None or "status" not in reply or "text" not in reply:
+        return None
+    return reply["status"], reply["text"]
+
+
+def is_running() -> bool:
+    """Check whether a daemon answers on the socket."""
+    return _request({"op": "ping"}, timeout=CONNECT_TIMEOUT) is not None
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            message = json.loads(line)
+            reply = self.server.dispatch(message)
+        except Exception as e:
+            reply = {"status": 0, "text": f"Daemon error: {e}"}
+        self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path):
+        super().__init__(path, _Handler)
+        self.pending = queue.Queue()
+
+    def dispatch(self, message: Dict) -> Dict:
+        # Imported lazily: discord_api imports this module to forward payloads
+        from .discord_api import STATUS_QUEUED, send_payload
+
+        op = message.get("op")
+        if op == "ping":
+            return {"status": 200, "text": "pong"}
+        if op == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"status": 200, "text": "Daemon stopping."}
+        if op != "send":
+            return {"status": 400, "text": f"Unknown operation '{op}'"}
+
+        kind, payload = message["kind"], message["payload"]
+        temporary = message.get("temporary", False)
+        if get_option("queue_mode"):
+            self.pending.put((kind, payload, temporary))
+            return {"status": STATUS_QUEUED,
+                    "text": f"Queued {kind} for delivery by the daemon ({self.pending.qsize()} pending)."}
+
+        status_code, response_text = send_payload(kind, payload, temporary=temporary)
+        return {"status": status_code, "text": response_text}
+
+    def deliver_pending(self):
+        """Worker delivering payloads queued in memory; failures go to the outbox."""
+        from .discord_api import send_payload
+
+        while True:
+            kind, payload, temporary = self.pending.get()
+            try:
+                send_payload(kind, payload, temporary=temporary)
+            finally:
+                self.pending.task_done()
+
+
+def _drain_outbox():
+    from .flush import handle_flush_command
+
+    handle_flush_command(watch=True, quiet=True)
+
+
+def run_daemon():
+    """Serve send requests on the Unix socket until stopped."""
+    global _serving
+
+    if is_running():
+        print(f"Daemon already running on {SOCKET_PATH}")
+        return
+
+    ensure_config_dir()
+    if os.path.exists(SOCKET_PATH):
+        os.remove(SOCKET_PATH)  # stale socket from a crashed daemon
+
+    # Warm up the connection pool and imports before accepting requests
+    from . import transport
+    transport.get_session()
+
+    _serving = True
+    server = _Server(SOCKET_PATH)
+    os.chmod(SOCKET_PATH, 0o600)
+    threading.Thread(target=server.deliver_pending, daemon=True).start()
+    threading.Thread(target=_drain_outbox, daemon=True).start()
+
+    print(f"Daemon listening on {SOCKET_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Let in-flight in-memory sends finish; anything failing lands in the outbox
+        server.pending.join()
+        server.server_close()
+        if os.path.exists(SOCKET_PATH):
+            os.remove(SOCKET_PATH)
+        transport.close_session()
+        _serving = False
+        print("Daemon stopped.")
+
+
+def handle_daemon_command(action='start', detach=False):
+    """Handle daemon command from CLI."""
+    if action == 'status':
+        if is_running():
+            print(f"Daemon is running on {SOCKET_PATH}")
+        else:
+            print("Daemon is not running.")
+    elif action == 'stop':
+        reply = _request({"op": "shutdown"}, timeout=CONNECT_TIMEOUT)
+        print(reply["text"] if reply else "Daemon is not running.")
+    elif detach:
+        if is_running():
+            print(f"Daemon already running on {SOCKET_PATH}")
+            return
+        subprocess.Popen(
+            [sys.executable, "-m", "discord_cli.cli", "daemon", "start"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+            close_fds=True,
+        )
+        print("Daemon started in the background.")
+    else:
+        run_daemon()
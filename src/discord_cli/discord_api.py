@@ -1,9 +1,27 @@
 """Discord API interaction utilities."""
 
+import hashlib
+import io
 import json
 import os
-import requests
-from .config import get_username
+import tempfile
+import threading
+from contextlib import ExitStack
+
+from . import daemon, imageopt, outbox, upload_index
+from .archive import archive_name, write_archive
+from .config import get_option, get_username
+from .embeds import batch_embeds
+from .hashing import hash_file
+from .multipart import MultipartBody
+from .parts import build_manifest, upload_in_parts, upload_stream_in_parts
+from .splitter import split_message
+
+SUCCESS_CODES = (200, 204)
+# Reported instead of an HTTP status when a payload was put in the outbox
+STATUS_QUEUED = 202
+# Discord's cap on attachments per message
+MAX_ATTACHMENTS = 10
 
 
 def get_username_with_suffix(suffix: str = None) -> str:
@@ -14,52 +32,500 @@ def get_username_with_suffix(suffix: str = None) -> str:
     return base_username
 
 
-def send_message_to_discord(content, webhook_url, thread_id=None, needs_thread=False, suffix=None):
-    """Send a text message to Discord."""
-    username = get_username_with_suffix(suffix)
-    data = {"username": username, "content": content}
-    params = {"thread_id": thread_id} if needs_thread and thread_id else {}
+def is_transient_failure(status_code: int) -> bool:
+    """Whether a failed send is worth retrying later from the outbox."""
+    return status_code == 0 or status_code == 429 or status_code >= 500
+
+
+def report_result(status_code, response_text, success_message, error_label) -> bool:
+    """Print the outcome of a send and return whether it was delivered or queued."""
+    if status_code in SUCCESS_CODES:
+        print(success_message)
+        return True
+    if status_code == STATUS_QUEUED:
+        print(response_text)
+        return True
+    print(f"Error sending {error_label}: {status_code} - {response_text}")
+    return False
+
+
+def _webhook_request(method, url, build=None, **kwargs):
+    """Call a webhook endpoint through the shared, rate limited transport."""
+    # Imported here so payloads relayed to the daemon never load requests
+    from . import transport
+
+    return transport.webhook_request(method, url, build=build, **kwargs)
+
+
+def _post_webhook(webhook_url, build=None, **kwargs):
+    """POST to a webhook through the shared, rate limited transport."""
+    return _webhook_request("POST", webhook_url, build=build, **kwargs)
+
+
+def _spool(kind, payload, status_code=None, temporary_file=None):
+    """Queue a payload in the outbox and describe that as a send result."""
+    pending = outbox.enqueue(kind, payload, temporary_file)
+    if status_code is None:
+        outbox.spawn_flusher()
+        return STATUS_QUEUED, f"Queued {kind} for background delivery ({pending} pending)."
+    return STATUS_QUEUED, (
+        f"Discord unreachable ({status_code}), {kind} queued in outbox "
+        f"({pending} pending). Run 'dc flush' to retry."
+    )
+
+
+def _send_or_spool(kind, payload, send, spool, temporary_file=None):
+    """Send now, or queue in the outbox in queue mode and on transient failures.
+
+    When a daemon is running the payload is handed to it instead.
+    """
+    if spool:
+        forwarded = daemon.forward(kind, payload, temporary_file is not None)
+        if forwarded is not None:
+            return forwarded
+
+    if spool and get_option("queue_mode"):
+        return _spool(kind, payload, temporary_file=temporary_file)
+
+    status_code, response_text = send()
+    if spool and is_transient_failure(status_code):
+        return _spool(kind, payload, status_code, temporary_file)
+
+    if temporary_file:
+        os.remove(temporary_file)
+    return status_code, response_text
 
-    response = requests.post(
-        webhook_url,
-        data=json.dumps(data),
+
+def send_message_to_discord(content, webhook_url, thread_id=None, needs_thread=False, suffix=None,
+                            spool=True, wait=False):
+    """Send a text message to Discord.
+
+    With ``wait`` Discord answers with the created message as JSON, which is
+    needed to edit it later; such sends are never queued.
+    """
+    def send():
+        username = get_username_with_suffix(suffix)
+        data = {"username": username, "content": content}
+        params = {"thread_id": thread_id} if needs_thread and thread_id else {}
+        if wait:
+            params["wait"] = "true"
+
+        return _post_webhook(
+            webhook_url,
+            data=json.dumps(data),
+            headers={"Content-Type": "application/json"},
+            params=params
+        )
+
+    payload = {"webhook_url": webhook_url, "thread_id": thread_id, "needs_thread": needs_thread,
+               "suffix": suffix, "content": content}
+    return _send_or_spool("message", payload, send, spool and not wait)
+
+
+def send_messages_to_discord(messages, webhook_url, thread_id=None, needs_thread=False, suffix=None):
+    """Send several messages back-to-back, stopping at the first failure.
+
+    The rate limiter paces the burst, so all parts go out as fast as the
+    webhook's bucket allows. Returns the result of the last send attempted.
+    """
+    status_code, response_text = 204, ""
+    for content in messages:
+        status_code, response_text = send_message_to_discord(
+            content, webhook_url, thread_id, needs_thread, suffix
+        )
+        if status_code not in SUCCESS_CODES and status_code != STATUS_QUEUED:
+            break
+    return status_code, response_text
+
+
+def edit_message_on_discord(message_id, content, webhook_url, thread_id=None, needs_thread=False):
+    """Replace the content of a message previously sent through the webhook."""
+    params = {"thread_id": thread_id} if needs_thread and thread_id else {}
+    return _webhook_request(
+        "PATCH",
+        f"{webhook_url}/messages/{message_id}",
+        data=json.dumps({"content": content}),
         headers={"Content-Type": "application/json"},
         params=params
     )
-    return response.status_code, response.text
 
 
-def send_file_to_discord(file_path, webhook_url, thread_id=None, needs_thread=False,
-                        comment=None, suffix=None):
-    """Send a file to Discord."""
+def _upload_files(attachments, webhook_url, thread_id=None, needs_thread=False, comment=None, suffix=None,
+                  progress=None, hashes=None, embeds=None):
+    """Upload open binary file objects as the attachments of one message.
+
+    ``attachments`` is a list of (filename, file). The multipart body is
+    streamed from the files in fixed-size chunks, so memory use does not grow
+    with their size. ``progress`` is called with (bytes sent, total bytes) as
+    the upload advances. If a ``hashes`` list is given it is filled with the
+    SHA-256 of each attachment, computed from the bytes as they are sent.
+    ``embeds`` (one message worth) are posted in the same request.
+    """
     username = get_username_with_suffix(suffix)
-    data = {
-        "username": username,
-        "content": comment if comment else "File upload"
-    }
+    if embeds:
+        # Embeds only travel as JSON, so the message goes in payload_json
+        message = {"username": username, "embeds": embeds}
+        if comment:
+            message["content"] = comment
+        data = {"payload_json": json.dumps(message)}
+    else:
+        data = {
+            "username": username,
+            "content": comment if comment else "File upload"
+        }
+    params = {"thread_id": thread_id} if needs_thread and thread_id else {}
+    # Answer with the created message so its links can be indexed
+    params["wait"] = "true"
+    starts = [file.tell() for _, file in attachments]
+    # A single attachment keeps the plain "file" field
+    names = ["file"] if len(attachments) == 1 else [f"files[{i}]" for i in range(len(attachments))]
+    digests = []
+
+    def build():
+        # Rewind so a rate limited retry re-sends the whole files
+        for (_, file), start in zip(attachments, starts):
+            file.seek(start)
+        digests[:] = [hashlib.sha256() for _ in attachments]
+        body = MultipartBody(data, [(name, filename, file) for name, (filename, file) in zip(names, attachments)],
+                             progress=progress,
+                             on_chunk=(lambda index, chunk: digests[index].update(chunk)) if hashes is not None else None)
+        return {
+            "data": body,
+            "headers": {"Content-Type": body.content_type},
+            "params": params,
+        }
+
+    result = _post_webhook(webhook_url, build=build)
+    if hashes is not None:
+        hashes[:] = [digest.hexdigest() for digest in digests]
+    return result
+
+
+def _upload_file(file, filename, webhook_url, thread_id=None, needs_thread=False, comment=None, suffix=None,
+                 progress=None):
+    """Upload an open binary file object as an attachment."""
+    return _upload_files([(filename, file)], webhook_url, thread_id, needs_thread, comment, suffix, progress)
+
+
+def _send_messages_with_embeds(messages, embeds, webhook_url, thread_id, needs_thread, suffix):
+    """Send messages back-to-back, with ``embeds`` attached to the first one."""
+    if not embeds:
+        return send_messages_to_discord(messages, webhook_url, thread_id, needs_thread, suffix)
+    status_code, response_text = send_embeds_to_discord(embeds, webhook_url, thread_id, needs_thread, suffix,
+                                                        content=messages[0])
+    if len(messages) > 1 and (status_code in SUCCESS_CODES or status_code == STATUS_QUEUED):
+        return send_messages_to_discord(messages[1:], webhook_url, thread_id, needs_thread, suffix)
+    return status_code, response_text
+
+
+def _send_manifest(filename, size, file_sha256, results, webhook_url, thread_id, needs_thread, comment, suffix,
+                   embeds=None):
+    """Report failed parts, or post the manifest once every part is uploaded."""
+    failed = [(name, status, text) for name, _, status, text in results if status not in SUCCESS_CODES]
+    if failed:
+        name, status_code, response_text = failed[0]
+        return status_code, f"{len(failed)} of {len(results)} parts failed (first: {name}: {response_text})"
+
+    manifest = build_manifest(filename, size, file_sha256, results, comment)
+    return _send_messages_with_embeds(split_message(manifest), embeds, webhook_url, thread_id, needs_thread, suffix)
+
+
+def _upload_in_parts(file_path, part_size, webhook_url, thread_id, needs_thread, comment, suffix,
+                     progress=None, embeds=None):
+    """Upload a file that exceeds the attachment limit as parts plus a manifest."""
+    filename = os.path.basename(file_path)
+    total_size = os.path.getsize(file_path)
+    part_sent = {}
+    lock = threading.Lock()
+
+    def upload_part(data, part_name, number, total):
+        def part_progress(sent, _):
+            # Parts upload concurrently; report the sum over all of them
+            with lock:
+                part_sent[number] = min(sent, len(data))
+                progress(sum(part_sent.values()), total_size)
+
+        return _upload_file(io.BytesIO(data), part_name, webhook_url, thread_id, needs_thread,
+                            f"📦 {filename} part {number}/{total}", suffix,
+                            part_progress if progress else None)
+
+    results, file_sha256 = upload_in_parts(file_path, part_size, upload_part, get_option("upload_workers"))
+    return _send_manifest(filename, total_size, file_sha256, results, webhook_url, thread_id, needs_thread,
+                          comment, suffix, embeds)
+
+
+def get_upload_limit() -> int:
+    """Largest attachment in bytes that is uploaded without splitting."""
+    return int(get_option("upload_limit_mb") * 1000 * 1000)
+
+
+def _dedup_enabled(dedup) -> bool:
+    return dedup and get_option("dedup")
+
+
+def _link_earlier(earlier, comment, webhook_url, thread_id, needs_thread, suffix, embeds=None):
+    """Post references to earlier uploads instead of uploading again."""
+    lines = [comment] if comment else []
+    lines.extend(upload_index.describe(entry) for entry in earlier)
+    return _send_messages_with_embeds(split_message("\n".join(lines)), embeds, webhook_url, thread_id, needs_thread,
+                                      suffix)
+
+
+def _upload_paths(file_paths, webhook_url, thread_id, needs_thread, comment, suffix, progress, dedup,
+                  optimize=False, embeds=None):
+    """Upload files as one message, linking to earlier uploads of the same content.
+
+    Each file is read once: its hash is computed while it streams into the
+    upload and recorded in the index afterwards. Only a file whose size
+    matches an earlier upload to this destination is hashed up front (from a
+    memory map), to check whether it can be linked instead. With
+    ``optimize`` images are re-encoded first and uploaded from memory.
+    """
+    destination = thread_id if needs_thread else None
+    use_index = _dedup_enabled(dedup)
+    optimized = imageopt.optimize_files(file_paths) if optimize else {}
+    # (path, filename, size, in-memory data or None)
+    sources = []
+    for path in file_paths:
+        if path in optimized:
+            data, filename = optimized[path]
+            sources.append((path, filename, len(data), data))
+        else:
+            sources.append((path, os.path.basename(path), os.path.getsize(path), None))
+
+    if use_index:
+        earlier = []
+        for source in list(sources):
+            path, _, size, data = source
+            if data is not None:
+                file_sha256 = hashlib.sha256(data).hexdigest()
+            elif upload_index.size_seen(size, webhook_url, destination):
+                file_sha256 = hash_file(path)
+            else:
+                continue
+            entry = upload_index.lookup(file_sha256, webhook_url, destination)
+            if entry:
+                earlier.append(entry)
+                sources.remove(source)
+        if earlier:
+            status_code, response_text = _link_earlier(earlier, comment if not sources else None,
+                                                       webhook_url, thread_id, needs_thread, suffix,
+                                                       embeds if not sources else None)
+            if not sources or status_code not in SUCCESS_CODES:
+                return status_code, response_text
+
+    hashes = [] if use_index else None
+    with ExitStack() as stack:
+        attachments = [(filename, io.BytesIO(data) if data is not None else stack.enter_context(open(path, 'rb')))
+                       for path, filename, _, data in sources]
+        status_code, response_text = _upload_files(attachments, webhook_url, thread_id, needs_thread,
+                                                   comment, suffix, progress, hashes, embeds)
+    if use_index and status_code in SUCCESS_CODES:
+        uploads = [(file_sha256, filename, size) for file_sha256, (_, filename, size, _) in zip(hashes, sources)]
+        upload_index.record(uploads, webhook_url, destination, response_text)
+    return status_code, response_text
+
+
+def send_file_to_discord(file_path, webhook_url, thread_id=None, needs_thread=False,
+                        comment=None, suffix=None, spool=True, temporary=False, progress=None, dedup=False,
+                        optimize=False, embeds=None):
+    """Send a file to Discord.
+
+    Files above the upload limit are sent as numbered parts followed by a
+    manifest message. With ``temporary`` the file is owned by this call: it
+    is deleted once sent, or moved into the outbox if it has to be queued.
+    ``progress`` is called with (bytes sent, total bytes) during the upload.
+    With ``dedup`` a file already posted to the same destination is linked
+    to instead of uploaded again. With ``optimize`` an image is re-encoded
+    according to the ``image_*`` options first. ``embeds`` (at most one
+    message worth) are posted with the file in the same request, or with the
+    manifest or link message.
+    """
+    def send():
+        part_size = get_upload_limit()
+        size = os.path.getsize(file_path)
+        if size > part_size:
+            return _upload_in_parts(file_path, part_size, webhook_url, thread_id, needs_thread, comment,
+                                    suffix, progress, embeds)
+
+        return _upload_paths([file_path], webhook_url, thread_id, needs_thread, comment, suffix, progress, dedup,
+                             optimize, embeds)
+
+    file_path = os.path.abspath(file_path)
+    payload = {"webhook_url": webhook_url, "thread_id": thread_id, "needs_thread": needs_thread,
+               "suffix": suffix, "comment": comment, "file_path": file_path, "dedup": dedup, "optimize": optimize}
+    if embeds:
+        payload["embeds"] = embeds
+    return _send_or_spool("file", payload, send, spool, file_path if temporary else None)
+
+
+def _spill(data, filename):
+    """Write in-memory data to a temporary file that the caller owns."""
+    fd, path = tempfile.mkstemp(suffix=f"-{filename}")
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    return path
+
+
+def send_bytes_to_discord(data, filename, webhook_url, thread_id=None, needs_thread=False,
+                          comment=None, suffix=None, dedup=False, optimize=False):
+    """Upload in-memory data as an attachment without a temporary file.
+
+    The data is only written to disk when it has to outlive this call: when
+    it is handed to the daemon, queued in the outbox, or split into parts.
+    With ``optimize`` an image is re-encoded first.
+    """
+    if optimize and imageopt.enabled() and imageopt.is_image(filename):
+        data, filename = imageopt.optimize_image(data, filename)
+    if len(data) > get_upload_limit() or get_option("queue_mode") or daemon.is_running():
+        return send_file_to_discord(_spill(data, filename), webhook_url, thread_id, needs_thread, comment, suffix,
+                                    temporary=True, dedup=dedup)
+
+    destination = thread_id if needs_thread else None
+    file_sha256 = hashlib.sha256(data).hexdigest() if _dedup_enabled(dedup) else None
+    if file_sha256:
+        earlier = upload_index.lookup(file_sha256, webhook_url, destination)
+        if earlier:
+            return _link_earlier([earlier], comment, webhook_url, thread_id, needs_thread, suffix)
+
+    status_code, response_text = _upload_file(io.BytesIO(data), filename, webhook_url, thread_id, needs_thread,
+                                              comment, suffix)
+    if is_transient_failure(status_code):
+        path = _spill(data, filename)
+        payload = {"webhook_url": webhook_url, "thread_id": thread_id, "needs_thread": needs_thread,
+                   "suffix": suffix, "comment": comment, "file_path": path, "dedup": dedup}
+        return _spool("file", payload, status_code, path)
+    if file_sha256 and status_code in SUCCESS_CODES:
+        upload_index.record([(file_sha256, filename, len(data))], webhook_url, destination, response_text)
+    return status_code, response_text
+
+
+def send_files_to_discord(file_paths, webhook_url, thread_id=None, needs_thread=False,
+                         comment=None, suffix=None, spool=True, progress=None, dedup=False, optimize=False):
+    """Send several files as the attachments of a single message.
+
+    The caller keeps the batch within MAX_ATTACHMENTS and the upload limit.
+    ``dedup`` and ``optimize`` work as for send_file_to_discord.
+    """
+    def send():
+        return _upload_paths(file_paths, webhook_url, thread_id, needs_thread, comment, suffix, progress, dedup,
+                             optimize)
+
+    file_paths = [os.path.abspath(path) for path in file_paths]
+    payload = {"webhook_url": webhook_url, "thread_id": thread_id, "needs_thread": needs_thread,
+               "suffix": suffix, "comment": comment, "file_paths": file_paths, "dedup": dedup,
+               "optimize": optimize}
+    return _send_or_spool("files", payload, send, spool)
+
+
+def send_archive_to_discord(paths, archive_format, webhook_url, thread_id=None, needs_thread=False,
+                           comment=None, suffix=None):
+    """Archive files and directories on the fly and upload the archive.
+
+    The archive is compressed straight into the upload and never written to
+    disk. If it outgrows the upload limit it goes out as numbered parts,
+    uploaded while the rest is still being compressed, followed by a
+    manifest. There is no file to queue, so archives are never spooled.
+    """
+    filename = archive_name(paths, archive_format)
+
+    def upload_part(data, part_name, number, total):
+        if total == 1:
+            label = comment
+        else:
+            label = f"📦 {filename} part {number}"
+        return _upload_file(io.BytesIO(data), part_name, webhook_url, thread_id, needs_thread, label, suffix)
+
+    results, file_sha256, size = upload_stream_in_parts(
+        filename, lambda out: write_archive(paths, archive_format, out),
+        get_upload_limit(), upload_part, get_option("upload_workers")
+    )
+    if len(results) == 1:
+        return results[0][2], results[0][3]
+    return _send_manifest(filename, size, file_sha256, results, webhook_url, thread_id, needs_thread,
+                          comment, suffix)
+
+
+def send_embed_to_discord(embed_data, webhook_url, thread_id=None, needs_thread=False, suffix=None,
+                          spool=True):
+    """Send a rich embed to Discord."""
+    return send_embeds_to_discord([embed_data], webhook_url, thread_id, needs_thread, suffix, spool=spool)
+
+
+def send_embeds_to_discord(embeds, webhook_url, thread_id=None, needs_thread=False, suffix=None,
+                           content=None, spool=True, vault_posting=None):
+    """Send embeds in as few messages as Discord's limits allow.
+
+    Embeds are grouped in order into messages of at most 10 embeds and 6000
+    characters; ``content`` goes with the first message. Stops at the first
+    failure and returns the result of the last send attempted.
+
+    ``vault_posting`` (see ``vault.posting``) is recorded in the credential
+    vault once the last message is delivered, which for a queued message is
+    whenever the daemon or ``dc flush`` gets it through.
+    """
     params = {"thread_id": thread_id} if needs_thread and thread_id else {}
 
-    with open(file_path, 'rb') as file:
-        files = {"file": (os.path.basename(file_path), file)}
-        response = requests.post(
+    def sender(data):
+        return lambda: _post_webhook(
             webhook_url,
-            data=data,
-            files=files,
+            data=json.dumps(data),
+            headers={"Content-Type": "application/json"},
             params=params
         )
-    return response.status_code, response.text
 
+    status_code, response_text = 204, ""
+    batches = list(batch_embeds(embeds))
+    for number, batch in enumerate(batches, 1):
+        data = {"username": get_username_with_suffix(suffix), "embeds": batch}
+        if content:
+            data["content"] = content
+        payload = {"webhook_url": webhook_url, "thread_id": thread_id, "needs_thread": needs_thread,
+                   "suffix": suffix, "embeds": batch, "content": content}
+        if vault_posting and number == len(batches):
+            payload["vault_posting"] = vault_posting
+        status_code, response_text = _send_or_spool("embeds", payload, sender(data), spool)
+        if status_code not in SUCCESS_CODES and status_code != STATUS_QUEUED:
+            break
+        content = None
 
-def send_embed_to_discord(embed_data, webhook_url, thread_id=None, needs_thread=False, suffix=None):
-    """Send a rich embed to Discord."""
-    username = get_username_with_suffix(suffix)
-    data = {"username": username, "embeds": [embed_data]}
-    params = {"thread_id": thread_id} if needs_thread and thread_id else {}
+    if vault_posting and status_code in SUCCESS_CODES:
+        # Imported here so that only credential shares load sqlite3
+        from . import vault
+        vault.record_posting(vault_posting, webhook_url, thread_id if needs_thread else None)
+    return status_code, response_text
 
-    response = requests.post(
-        webhook_url,
-        data=json.dumps(data),
-        headers={"Content-Type": "application/json"},
-        params=params
-    )
-    return response.status_code, response.text
\ No newline at end of file
+
+def send_payload(kind, payload, spool=True, temporary=False):
+    """Send a payload in the serialized form used by the outbox and the daemon."""
+    target = (payload["webhook_url"], payload.get("thread_id"), payload.get("needs_thread", False))
+    suffix = payload.get("suffix")
+
+    if kind == "message":
+        return send_message_to_discord(payload["content"], *target, suffix=suffix, spool=spool)
+    if kind == "embed":
+        # Queued by versions that sent one embed per payload
+        return send_embed_to_discord(payload["embed"], *target, suffix=suffix, spool=spool)
+    if kind == "embeds":
+        return send_embeds_to_discord(payload["embeds"], *target, suffix=suffix, content=payload.get("content"),
+                                      spool=spool, vault_posting=payload.get("vault_posting"))
+    if kind == "file":
+        if not os.path.exists(payload["file_path"]):
+            return 404, f"File '{payload['file_path']}' no longer exists"
+        return send_file_to_discord(payload["file_path"], *target, comment=payload.get("comment"),
+                                    suffix=suffix, spool=spool, temporary=temporary,
+                                    dedup=payload.get("dedup", False), optimize=payload.get("optimize", False),
+                                    embeds=payload.get("embeds"))
+    if kind == "files":
+        missing = [path for path in payload["file_paths"] if not os.path.exists(path)]
+        if missing:
+            return 404, f"File '{missing[0]}' no longer exists"
+        return send_files_to_discord(payload["file_paths"], *target, comment=payload.get("comment"),
+                                     suffix=suffix, spool=spool, dedup=payload.get("dedup", False),
+                                     optimize=payload.get("optimize", False))
+    return 400, f"Unknown payload kind '{kind}'"
+
+
+def deliver_spooled(entry):
+    """Deliver an outbox entry directly, without re-queueing it on failure."""
+    return send_payload(entry["kind"], entry, spool=False)
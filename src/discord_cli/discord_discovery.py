@@ -1,9 +1,12 @@
 """Discord API integration for discovering channels and threads."""
 
 import re
-import requests
 from typing import Dict, List, Optional, Tuple
 
+import requests
+
+from . import transport
+
 
 def extract_webhook_info(webhook_url: str) -> Tuple[Optional[str], Optional[str]]:
     """Extract webhook ID and token from webhook URL."""
@@ -21,7 +24,7 @@ def get_webhook_info(webhook_url: str) -> Optional[Dict]:
         return None
 
     try:
-        response = requests.get(f"https://discord.com/api/webhooks/{webhook_id}/{webhook_token}")
+        response = transport.get(f"https://discord.com/api/webhooks/{webhook_id}/{webhook_token}")
         if response.status_code == 200:
             return response.json()
     except requests.RequestException:
@@ -49,7 +52,7 @@ def get_channel_threads(webhook_url: str) -> List[Dict]:
 
     try:
         # Try to get active threads using the webhook (limited permissions)
-        response = requests.get(
+        response = transport.get(
             f"https://discord.com/api/channels/{channel_id}/threads/active",
             headers={"Authorization": f"Bot {webhook_token}"}  # This won't work, but worth a try
         )
@@ -0,0 +1,39 @@
+"""Pack embeds into as few Discord messages as the limits allow."""
+
+from typing import Dict, Iterable, Iterator, List
+
+# Discord limits for one message
+MAX_EMBEDS = 10
+MAX_EMBED_CHARS = 6000
+MAX_FIELDS = 25
+MAX_FIELD_NAME = 256
+MAX_FIELD_VALUE = 1024
+
+
+def embed_length(embed: Dict) -> int:
+    """Characters of ``embed`` that count towards the 6000 per message."""
+    length = len(embed.get("title") or "") + len(embed.get("description") or "")
+    length += len((embed.get("footer") or {}).get("text") or "")
+    length += len((embed.get("author") or {}).get("name") or "")
+    for field in embed.get("fields") or ():
+        length += len(field.get("name") or "") + len(field.get("value") or "")
+    return length
+
+
+def batch_embeds(embeds: Iterable[Dict]) -> Iterator[List[Dict]]:
+    """Group embeds, in order, into messages of at most 10 embeds and 6000 characters.
+
+    An embed that exceeds the character budget on its own is sent alone and
+    left for Discord to reject.
+    """
+    batch: List[Dict] = []
+    batch_chars = 0
+    for embed in embeds:
+        length = embed_length(embed)
+        if batch and (len(batch) == MAX_EMBEDS or batch_chars + length > MAX_EMBED_CHARS):
+            yield batch
+            batch, batch_chars = [], 0
+        batch.append(embed)
+        batch_chars += length
+    if batch:
+        yield batch
@@ -0,0 +1,70 @@
+"""Deliver payloads queued in the outbox."""
+
+import time
+
+from . import outbox
+from .discord_api import SUCCESS_CODES, deliver_spooled, is_transient_failure
+
+IDLE_INTERVAL = 5
+MIN_BACKOFF = 2
+MAX_BACKOFF = 300
+
+
+def flush_outbox(quiet=False):
+    """Deliver queued entries in order until the outbox is empty or Discord fails.
+
+    Returns (delivered, remaining). Entries rejected permanently by Discord
+    (e.g. 400 or 413) are dropped so they cannot block the queue.
+    """
+    delivered = 0
+    for entry in outbox.load_entries():
+        status_code, response_text = deliver_spooled(entry)
+
+        if status_code in SUCCESS_CODES:
+            outbox.remove(entry)
+            delivered += 1
+            continue
+
+        if is_transient_failure(status_code):
+            if not quiet:
+                print(f"Delivery paused: {status_code} - {response_text}")
+            break
+
+        outbox.remove(entry)
+        if not quiet:
+            print(f"Dropped queued {entry['kind']}: {status_code} - {response_text}")
+
+    return delivered, outbox.count_entries()
+
+
+def handle_flush_command(watch=False, quiet=False):
+    """Handle flush command from CLI."""
+    backoff = MIN_BACKOFF
+
+    while True:
+        with outbox.flush_lock() as acquired:
+            if not acquired:
+                if not quiet:
+                    print("Another 'dc flush' is already delivering the outbox.")
+                return
+            delivered, remaining = flush_outbox(quiet)
+
+        if not quiet and (delivered or remaining):
+            print(f"Delivered {delivered} queued item(s), {remaining} remaining.")
+
+        if remaining == 0:
+            if not watch:
+                # An item queued while we held the lock may have found its
+                # spawned flusher locked out, so check once more.
+                if outbox.count_entries() == 0:
+                    return
+                continue
+            backoff = MIN_BACKOFF
+            time.sleep(IDLE_INTERVAL)
+        elif delivered == 0:
+            if not watch:
+                return
+            time.sleep(backoff)
+            backoff = min(backoff * 2, MAX_BACKOFF)
+        else:
+            backoff = MIN_BACKOFF
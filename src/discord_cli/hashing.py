@@ -0,0 +1,25 @@
+"""SHA-256 of files without copying them through Python buffers."""
+
+import hashlib
+import mmap
+import os
+
+CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def hash_file(file_path: str) -> str:
+    """SHA-256 of a file, hashed straight from a read-only memory map.
+
+    Slices of the map are handed to hashlib as memoryviews, so no data is
+    copied and the GIL is released while hashing. The pages stay in the page
+    cache, which makes an upload right after hashing cheap to read.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return digest.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+            for offset in range(0, size, CHUNK_SIZE):
+                digest.update(view[offset:offset + CHUNK_SIZE])
+    return digest.hexdigest()
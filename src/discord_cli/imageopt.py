@@ -0,0 +1,97 @@
+"""Re-encoding of screenshots and other images before upload.
+
+Needs the optional ``Pillow`` package (``pip install discord-cli[images]``)
+and is enabled with the ``image_optimize`` option: ``png`` (lossless,
+optimized), ``webp`` or ``jpeg``. Images larger than
+``image_max_dimension`` pixels on their longest side are scaled down first.
+"""
+
+import importlib.util
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+from .config import get_option
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".webp", ".tif", ".tiff")
+FORMATS = {"png": ("PNG", ".png"), "webp": ("WEBP", ".webp"), "jpeg": ("JPEG", ".jpg")}
+# Larger inputs are uploaded untouched rather than decoded into memory
+MAX_INPUT_SIZE = 200 * 1000 * 1000
+
+
+def enabled() -> bool:
+    """Whether images should be re-encoded before upload.
+
+    Pillow is only looked up here, not imported: it costs tens of
+    milliseconds and most commands never touch an image.
+    """
+    return get_option("image_optimize") != "off" and importlib.util.find_spec("PIL") is not None
+
+
+def is_image(filename: str) -> bool:
+    return filename.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def optimize_image(data: bytes, filename: str) -> Tuple[bytes, str]:
+    """Re-encode an image; returns (data, filename), unchanged unless it got smaller."""
+    from PIL import Image, ImageOps
+
+    target, extension = FORMATS[get_option("image_optimize")]
+    try:
+        image = Image.open(io.BytesIO(data))
+        if getattr(image, "is_animated", False):
+            return data, filename
+        image.load()
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return data, filename
+
+    # Re-encoding drops EXIF, so bake its orientation into the pixels first
+    image = ImageOps.exif_transpose(image)
+    max_dimension = get_option("image_max_dimension")
+    if max_dimension and max(image.size) > max_dimension:
+        image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+
+    quality = min(max(get_option("image_quality"), 1), 100)
+    out = io.BytesIO()
+    try:
+        if target == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        elif image.mode == "CMYK":
+            # Neither PNG nor WebP can store CMYK
+            image = image.convert("RGB")
+        if target == "PNG":
+            image.save(out, "PNG", optimize=True)
+        elif target == "WEBP":
+            image.save(out, "WEBP", quality=quality, method=4)
+        else:
+            image.save(out, "JPEG", quality=quality, optimize=True, progressive=True)
+    except (OSError, ValueError):
+        # A mode or format the encoder cannot write: upload the original
+        return data, filename
+
+    optimized = out.getvalue()
+    if len(optimized) >= len(data):
+        return data, filename
+    return optimized, os.path.splitext(filename)[0] + extension
+
+
+def _optimize_path(file_path: str) -> Tuple[bytes, str]:
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    return optimize_image(data, os.path.basename(file_path))
+
+
+def optimize_files(file_paths: List[str]) -> Dict[str, Tuple[bytes, str]]:
+    """Re-encode the images among ``file_paths`` on worker threads.
+
+    Pillow releases the GIL while encoding, so several images are processed
+    in parallel. Returns {path: (data, filename)} for the images only.
+    """
+    if not enabled():
+        return {}
+    images = [path for path in file_paths if is_image(path) and os.path.getsize(path) <= MAX_INPUT_SIZE]
+    if not images:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(len(images), os.cpu_count() or 1)) as pool:
+        return dict(zip(images, pool.map(_optimize_path, images)))
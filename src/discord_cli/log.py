@@ -1,24 +1,128 @@
 """Send command output to Discord."""
 
 import argparse
+import codecs
 import os
+import selectors
+import stat
 import subprocess
 import sys
-import tempfile
 
-from .config import load_webhook_config
-from .discord_api import send_message_to_discord, send_file_to_discord
+from .capture import OutputCapture
+from .compress import maybe_compress
+from .config import get_option, load_webhook_config
+from .discord_api import send_messages_to_discord, send_file_to_discord, report_result
+from .splitter import DISCORD_CHAR_LIMIT, split_message
+from .stream import LiveMessageStream
 
-DISCORD_CHAR_LIMIT = 2000
+READ_SIZE = 65536
 
 
-def handle_log_command(command_args, comment=None):
-    """Handle log command from CLI."""
+def build_prompt(command):
+    """Render the shell prompt header shown above logged output."""
+    user = os.getenv("USER", "user")
+    hostname = os.uname().nodename
+    cwd = os.getcwd()
+    return f"┌──({user}@{hostname})-[{cwd}]\n└─$ {command}\n"
+
+
+def _read_all(fd):
+    """Yield blocking reads from ``fd`` until EOF."""
+    while True:
+        chunk = os.read(fd, READ_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _read_chunks(fd, interval):
+    """Yield what is read from ``fd`` until EOF, or None after ``interval`` seconds without data.
+
+    Regular files (``dc log - < out.txt``) are always readable and cannot be
+    registered with epoll, and neither can ``/dev/null`` and some other
+    character devices, so those are read directly; pipes, ttys and sockets go
+    through the selector.
+    """
+    if stat.S_ISREG(os.fstat(fd).st_mode):
+        yield from _read_all(fd)
+        return
+
+    with selectors.DefaultSelector() as selector:
+        try:
+            selector.register(fd, selectors.EVENT_READ)
+        except OSError:
+            yield from _read_all(fd)
+            return
+        while True:
+            if not selector.select(timeout=interval):
+                yield None
+                continue
+            chunk = os.read(fd, READ_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+def pump(fd, sink, tee=False):
+    """Feed everything readable from ``fd`` to ``sink`` until EOF.
+
+    ``sink.tick()`` is called at least every ``sink.interval`` seconds (or
+    after each chunk when the interval is None). With ``tee`` the raw bytes
+    are also written to stdout as they arrive.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    out = sys.stdout.buffer if tee else None
+
+    for chunk in _read_chunks(fd, sink.interval):
+        if chunk:
+            if out:
+                out.write(chunk)
+                out.flush()
+            sink.feed(decoder.decode(chunk))
+        sink.tick()
+
+    sink.feed(decoder.decode(b"", final=True))
+
+
+def run_command(command_args, sink, tee=False):
+    """Run a command, feeding its combined stdout/stderr to ``sink``; returns the exit status."""
+    process = subprocess.Popen(command_args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    pump(process.stdout.fileno(), sink, tee)
+    process.stdout.close()
+    return process.wait()
+
+
+def read_stdin(sink, tee=False):
+    """Feed standard input to ``sink`` until EOF."""
+    pump(sys.stdin.fileno(), sink, tee)
+
+
+def tail_preview(comment, tail):
+    """Attachment message: the comment plus the last complete lines of output."""
+    comment_part = f"{comment}\n" if comment else ""
+    budget = DISCORD_CHAR_LIMIT - len(comment_part) - len("```\n…\n\n```")
+    tail = tail[-budget:]
+    if "\n" in tail:
+        # Drop the partial first line left by the cut
+        tail = tail.split("\n", 1)[1]
+    tail = tail.rstrip("\n")
+    if not tail:
+        return comment
+    return f"{comment_part}```\n…\n{tail}\n```"
+
+
+def handle_log_command(command_args, comment=None, stream=False, tee=False, label=None, force=False):
+    """Handle log command from CLI.
+
+    A command of ``-`` reads the output from standard input instead, so
+    ``dc log`` can sit at the end of an existing pipeline.
+    """
     if not command_args:
         print("Error: No command provided.")
         sys.exit(1)
 
-    command = " ".join(command_args)
+    from_stdin = command_args == ["-"]
+    command = label or ("<stdin>" if from_stdin else " ".join(command_args))
 
     try:
         webhook_url, thread_id, needs_thread = load_webhook_config()
@@ -26,40 +130,48 @@ def handle_log_command(command_args, comment=None):
         print(f"Error: {e}")
         sys.exit(1)
 
-    # Execute the command and capture the output
-    try:
-        result = subprocess.run(command_args, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        output = result.stdout + result.stderr
-    except subprocess.CalledProcessError as e:
-        output = e.stdout + e.stderr
-
-    user = os.getenv("USER", "user")
-    hostname = os.uname().nodename
-    cwd = os.getcwd()
-    prompt = f"┌──({user}@{hostname})-[{cwd}]\n└─$ {command}\n"
+    prompt = build_prompt(command)
+
+    if stream:
+        live = LiveMessageStream(prompt, comment, webhook_url, thread_id, needs_thread, "CLI")
+        if from_stdin:
+            read_stdin(live, tee)
+        else:
+            run_command(command_args, live, tee)
+        status_code, response_text = live.close()
+        report_result(status_code, response_text, "Output streamed successfully.", "output")
+        return
+
+    # Execute the command; output goes to a temp file with only a preview in memory.
+    # Up to split_max_messages messages worth of output is sent inline; 0 always attaches.
+    max_messages = get_option("split_max_messages")
     comment_part = f"{comment}\n" if comment else ""
-    message_content = f"{comment_part}```\n{prompt}{output}\n```"
-
-    # Check length and send as a message if <= 2000 characters, otherwise as a file
-    if len(message_content) <= DISCORD_CHAR_LIMIT:
-        status_code, response_text = send_message_to_discord(
-            message_content, webhook_url, thread_id, needs_thread, "CLI"
+    inline_budget = DISCORD_CHAR_LIMIT * max_messages - len(comment_part) - len(prompt) - len("```\n\n```")
+    capture = OutputCapture(f"{prompt}\n", max(inline_budget, 0))
+    if from_stdin:
+        read_stdin(capture, tee)
+    else:
+        run_command(command_args, capture, tee)
+    capture.close()
+
+    messages = None
+    if capture.complete:
+        messages = split_message(f"{comment_part}```\n{prompt}{capture.head}\n```")
+
+    # Send as message(s) if it fits, otherwise as a file
+    if messages and len(messages) <= max_messages:
+        os.remove(capture.path)
+        status_code, response_text = send_messages_to_discord(
+            messages, webhook_url, thread_id, needs_thread, "CLI"
         )
     else:
-        with tempfile.NamedTemporaryFile(delete=False, mode="w", suffix=".txt") as temp_file:
-            temp_file.write(f"{prompt}\n{output}")
-            temp_file_path = temp_file.name
-
+        upload_path, _ = maybe_compress(capture.path, temporary=True)
         status_code, response_text = send_file_to_discord(
-            temp_file_path, webhook_url, thread_id, needs_thread, comment, "CLI"
+            upload_path, webhook_url, thread_id, needs_thread, tail_preview(comment, capture.tail),
+            "CLI", temporary=True, dedup=not force
         )
 
-        os.remove(temp_file_path)
-
-    if status_code in [200, 204]:
-        print("Message sent successfully.")
-    else:
-        print(f"Error sending message: {status_code} - {response_text}")
+    report_result(status_code, response_text, "Message sent successfully.", "message")
 
 
 def main():
@@ -68,53 +180,11 @@ def main():
         description="Send terminal command output to Discord using a webhook."
     )
     parser.add_argument("-c", "--comment", help="Optional comment to include", default=None)
-    parser.add_argument("command", nargs=argparse.REMAINDER, help="The command to execute")
+    parser.add_argument("-s", "--stream", action="store_true", help="Stream output live by editing a message")
+    parser.add_argument("-t", "--tee", action="store_true", help="Also print the output to the terminal")
+    parser.add_argument("-l", "--label", help="Command text shown in the prompt header")
+    parser.add_argument("-F", "--force", action="store_true", help="Upload even if identical content was already posted")
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="The command to execute, or - to read stdin")
 
     args = parser.parse_args()
-
-    if not args.command:
-        print("Error: No command provided.")
-        sys.exit(1)
-
-    command = " ".join(args.command)
-
-    try:
-        webhook_url, thread_id, needs_thread = load_webhook_config()
-    except ValueError as e:
-        print(f"Error: {e}")
-        sys.exit(1)
-
-    # Execute the command and capture the output
-    try:
-        result = subprocess.run(args.command, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        output = result.stdout + result.stderr
-    except subprocess.CalledProcessError as e:
-        output = e.stdout + e.stderr
-
-    user = os.getenv("USER", "user")
-    hostname = os.uname().nodename
-    cwd = os.getcwd()
-    prompt = f"┌──({user}@{hostname})-[{cwd}]\n└─$ {command}\n"
-    comment_part = f"{args.comment}\n" if args.comment else ""
-    message_content = f"{comment_part}```\n{prompt}{output}\n```"
-
-    # Check length and send as a message if <= 2000 characters, otherwise as a file
-    if len(message_content) <= DISCORD_CHAR_LIMIT:
-        status_code, response_text = send_message_to_discord(
-            message_content, webhook_url, thread_id, needs_thread, "CLI"
-        )
-    else:
-        with tempfile.NamedTemporaryFile(delete=False, mode="w", suffix=".txt") as temp_file:
-            temp_file.write(f"{prompt}\n{output}")
-            temp_file_path = temp_file.name
-
-        status_code, response_text = send_file_to_discord(
-            temp_file_path, webhook_url, thread_id, needs_thread, args.comment, "Yeeb - CLI"
-        )
-
-        os.remove(temp_file_path)
-
-    if status_code in [200, 204]:
-        print("Message sent successfully.")
-    else:
-        print(f"Error sending message: {status_code} - {response_text}")
\ No newline at end of file
+    handle_log_command(args.command, args.comment, args.stream, args.tee, args.label, args.force)
@@ -2,9 +2,9 @@
 
 import sys
 from .config import (
-    load_config, save_config, set_default_webhook as config_set_default_webhook,
+    load_config, config_transaction, set_default_webhook as config_set_default_webhook,
     set_default_thread as config_set_default_thread, set_use_threads, show_config, migrate_from_env,
-    get_username, set_username
+    get_username, set_username, get_option, set_option, parse_option_value, OPTION_DEFAULTS
 )
 
 
@@ -59,11 +59,10 @@ def list_webhooks():
 
 def add_webhook(name, url, set_default=False):
     """Add a new webhook."""
-    config = load_config()
-    config["webhooks"][name] = url
-    if set_default:
-        config["settings"]["default_webhook"] = name
-    save_config(config)
+    with config_transaction() as config:
+        config["webhooks"][name] = url
+        if set_default:
+            config["settings"]["default_webhook"] = name
     print(f"Added webhook '{name}' with URL: {url}")
     if set_default:
         print(f"Set default webhook to '{name}'")
@@ -107,11 +106,11 @@ def remove_webhook():
         selection = int(input("Select a webhook to remove: "))
         if 1 <= selection <= len(webhook_names):
             name = webhook_names[selection - 1]
-            del config["webhooks"][name]
-            # Clear default if removing the default webhook
-            if config["settings"].get("default_webhook") == name:
-                config["settings"]["default_webhook"] = None
-            save_config(config)
+            with config_transaction() as config:
+                config["webhooks"].pop(name, None)
+                # Clear default if removing the default webhook
+                if config["settings"].get("default_webhook") == name:
+                    config["settings"]["default_webhook"] = None
             print(f"Removed webhook '{name}'")
         else:
             print("Invalid selection.")
@@ -164,11 +163,10 @@ def list_threads():
 
 def add_thread(name, thread_id, force=False):
     """Add a new thread."""
-    config = load_config()
-    config["threads"][name] = thread_id
-    if force:
-        config["settings"]["default_thread"] = name
-    save_config(config)
+    with config_transaction() as config:
+        config["threads"][name] = thread_id
+        if force:
+            config["settings"]["default_thread"] = name
     print(f"Added thread '{name}' with ID: {thread_id}")
     if force:
         print(f"Set default thread to '{name}'")
@@ -231,6 +229,25 @@ def set_username_interactive():
     print("This will appear in Discord as '{username} - {suffix}' for different commands.")
 
 
+def list_options():
+    """List tunable options with their current values."""
+    print("Tunable options:")
+    for name in sorted(OPTION_DEFAULTS):
+        print(f"  {name}: {get_option(name)} (default: {OPTION_DEFAULTS[name]})")
+
+
+def set_option_value(name, raw_value):
+    """Validate and set a tunable option."""
+    try:
+        value = parse_option_value(name, raw_value)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    set_option(name, value)
+    print(f"Set option '{name}' to {value}")
+
+
 def main():
     """Main entry point for dcmanage command."""
     if len(sys.argv) < 2:
@@ -0,0 +1,118 @@
+"""Durable on-disk outbox for payloads that could not be delivered yet.
+
+Entries are stored one JSON object per line in ``outbox.jsonl`` next to the
+config file and are delivered in order by ``dc flush``. Temporary files
+referenced by queued uploads are moved into the ``outbox/`` directory so
+they survive until delivery.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, List
+
+from .config import CONFIG_PATH, ensure_config_dir, locked_file
+
+CONFIG_DIR = os.path.dirname(CONFIG_PATH)
+OUTBOX_PATH = os.path.join(CONFIG_DIR, "outbox.jsonl")
+OUTBOX_DIR = os.path.join(CONFIG_DIR, "outbox")
+LOCK_PATH = os.path.join(CONFIG_DIR, "outbox.lock")
+FLUSH_LOCK_PATH = os.path.join(CONFIG_DIR, "flush.lock")
+
+
+def _read_entries() -> List[Dict]:
+    if not os.path.exists(OUTBOX_PATH):
+        return []
+    entries = []
+    with open(OUTBOX_PATH, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                # A crash mid-append leaves at most one partial line behind
+                continue
+    return entries
+
+
+def load_entries() -> List[Dict]:
+    """Return all queued entries, oldest first."""
+    with locked_file(LOCK_PATH):
+        return _read_entries()
+
+
+def count_entries() -> int:
+    """Return the number of queued entries."""
+    return len(load_entries())
+
+
+def enqueue(kind: str, payload: Dict, temporary_file: str = None) -> int:
+    """Append a payload to the outbox and return the new queue length.
+
+    ``temporary_file`` is moved into the outbox directory and the payload's
+    ``file_path`` is pointed at the moved copy.
+    """
+    entry = dict(payload)
+    entry["id"] = uuid.uuid4().hex
+    entry["kind"] = kind
+    entry["created"] = time.time()
+
+    ensure_config_dir()
+    if temporary_file:
+        os.makedirs(OUTBOX_DIR, mode=0o700, exist_ok=True)
+        spooled_path = os.path.join(OUTBOX_DIR, f"{entry['id']}-{os.path.basename(temporary_file)}")
+        shutil.move(temporary_file, spooled_path)
+        entry["file_path"] = spooled_path
+        entry["temporary"] = True
+
+    with locked_file(LOCK_PATH):
+        with open(OUTBOX_PATH, 'a') as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        return len(_read_entries())
+
+
+def remove(entry: Dict):
+    """Remove a delivered or dropped entry and its spooled file."""
+    with locked_file(LOCK_PATH):
+        remaining = [e for e in _read_entries() if e.get("id") != entry.get("id")]
+        tmp_path = f"{OUTBOX_PATH}.tmp"
+        with open(tmp_path, 'w') as f:
+            for e in remaining:
+                f.write(json.dumps(e) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, OUTBOX_PATH)
+
+    if entry.get("temporary") and entry.get("file_path"):
+        try:
+            os.remove(entry["file_path"])
+        except FileNotFoundError:
+            pass
+
+
+@contextmanager
+def flush_lock():
+    """Hold the single-flusher lock; yields False if another flusher runs."""
+    with locked_file(FLUSH_LOCK_PATH, blocking=False) as acquired:
+        yield acquired
+
+
+def spawn_flusher():
+    """Start a detached background 'dc flush' process."""
+    subprocess.Popen(
+        [sys.executable, "-m", "discord_cli.cli", "flush", "--quiet"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+        close_fds=True,
+    )
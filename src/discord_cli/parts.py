@@ -0,0 +1,160 @@
+"""Splitting files above Discord's attachment limit into numbered parts."""
+
+import hashlib
+import math
+import os
+import shlex
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Tuple
+
+# (part name, part sha256, status code, response text)
+PartResult = Tuple[str, str, int, str]
+
+
+def format_size(size: float) -> str:
+    """Human readable byte count."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1000 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1000
+
+
+class _PartUploader:
+    """Hash parts and hand them to a thread pool, ``workers + 1`` at a time."""
+
+    def __init__(self, filename: str, width: int, upload_part: Callable, pool: ThreadPoolExecutor,
+                 workers: int):
+        self.filename = filename
+        self.width = width
+        self.upload_part = upload_part
+        self.pool = pool
+        self.in_flight = threading.BoundedSemaphore(workers + 1)
+        self.file_hash = hashlib.sha256()
+        self.size = 0
+        self.submitted = []
+
+    def reserve(self):
+        """Block until another part may be held in memory."""
+        self.in_flight.acquire()
+
+    def submit(self, data: bytes, number: int, total, part_name: str = None):
+        """Upload one part; a slot must have been reserved first."""
+        self.file_hash.update(data)
+        self.size += len(data)
+        part_name = part_name or f"{self.filename}.part{number:0{self.width}d}"
+        future = self.pool.submit(self.upload_part, data, part_name, number, total)
+        future.add_done_callback(lambda _: self.in_flight.release())
+        self.submitted.append((part_name, hashlib.sha256(data).hexdigest(), future))
+
+    def results(self) -> List[PartResult]:
+        return [(name, digest, *future.result()) for name, digest, future in self.submitted]
+
+
+def upload_in_parts(file_path: str, part_size: int, upload_part: Callable, workers: int
+                    ) -> Tuple[List[PartResult], str]:
+    """Upload ``file_path`` as numbered parts, several at a time.
+
+    The file is read once, sequentially; each part is hashed as it is read
+    and handed to ``upload_part(data, part_name, number, total)``, which
+    returns (status_code, response_text). At most ``workers + 1`` parts are
+    held in memory at once. Returns the per-part results in order and the
+    SHA-256 of the whole file.
+    """
+    workers = max(workers, 1)
+    filename = os.path.basename(file_path)
+    total = max(1, math.ceil(os.path.getsize(file_path) / part_size))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool, open(file_path, 'rb') as f:
+        uploader = _PartUploader(filename, max(3, len(str(total))), upload_part, pool, workers)
+        for number in range(1, total + 1):
+            uploader.reserve()
+            uploader.submit(f.read(part_size), number, total)
+
+    return uploader.results(), uploader.file_hash.hexdigest()
+
+
+class _PartWriter:
+    """Write-only file object that cuts everything written to it into parts.
+
+    The first part is held back until a second one exists, so output that
+    fits in a single part is uploaded under its plain name.
+    """
+
+    def __init__(self, uploader: _PartUploader, part_size: int):
+        self.uploader = uploader
+        self.part_size = part_size
+        self.buffer = bytearray()
+        self.first = None
+        self.count = 0
+
+    def _emit(self, data: bytes):
+        self.uploader.reserve()
+        self.count += 1
+        if self.count == 1:
+            self.first = data
+            return
+        if self.first is not None:
+            self.uploader.submit(self.first, 1, None)
+            self.first = None
+        self.uploader.submit(data, self.count, None)
+
+    def write(self, data) -> int:
+        self.buffer += data
+        while len(self.buffer) >= self.part_size:
+            self._emit(bytes(self.buffer[:self.part_size]))
+            del self.buffer[:self.part_size]
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def finish(self):
+        """Upload whatever is still buffered."""
+        if self.buffer or not self.count:
+            self._emit(bytes(self.buffer))
+            self.buffer = bytearray()
+        if self.first is not None:
+            self.uploader.submit(self.first, 1, 1, self.uploader.filename)
+            self.first = None
+
+
+def upload_stream_in_parts(filename: str, produce: Callable, part_size: int, upload_part: Callable,
+                           workers: int) -> Tuple[List[PartResult], str, int]:
+    """Upload the output of ``produce(fileobj)`` as parts while it is generated.
+
+    ``produce`` writes a stream of unknown length (an archive, say) to the
+    file object it is given; nothing touches the disk. Memory is bounded to
+    a few parts as with ``upload_in_parts``. The part count is unknown while
+    uploading, so ``upload_part`` receives ``None`` as the total, except
+    when everything fits in one part: that is uploaded as ``filename`` with
+    a total of 1. Returns the results, SHA-256 and size of the stream.
+    """
+    workers = max(workers, 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # Four digits keep 'cat name.part*' in order up to 9999 parts
+        uploader = _PartUploader(filename, 4, upload_part, pool, workers)
+        writer = _PartWriter(uploader, part_size)
+        produce(writer)
+        writer.finish()
+
+    return uploader.results(), uploader.file_hash.hexdigest(), uploader.size
+
+
+def build_manifest(filename: str, size: int, file_sha256: str, parts: List[PartResult],
+                   comment: str = None) -> str:
+    """Describe a split upload: part hashes plus a one-line reassembly command."""
+    lines = []
+    if comment:
+        lines.append(comment)
+    lines.append(f"📦 **{filename}** ({format_size(size)}) was split into {len(parts)} parts")
+    lines.append(f"SHA-256: `{file_sha256}`")
+    lines.append("```")
+    lines.extend(f"{digest}  {name}" for name, digest, _, _ in parts)
+    lines.append("```")
+    lines.append("Reassemble:")
+    lines.append("```bash")
+    quoted = shlex.quote(filename)
+    lines.append(f"cat {quoted}.part* > {quoted} && echo {shlex.quote(f'{file_sha256}  {filename}')} | sha256sum -c")
+    lines.append("```")
+    return "\n".join(lines)
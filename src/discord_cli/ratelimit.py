@@ -0,0 +1,111 @@
+"""Client-side tracking of Discord rate limit buckets.
+
+Discord reports the state of the bucket a route belongs to on every
+response (``X-RateLimit-Bucket``, ``X-RateLimit-Remaining`` and
+``X-RateLimit-Reset-After``). Tracking those lets us pause just before a
+bucket runs dry instead of bouncing off 429 responses.
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+
+class _Bucket:
+    """Known state of a single rate limit bucket."""
+
+    __slots__ = ("remaining", "reset_at")
+
+    def __init__(self):
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+
+
+class RateLimiter:
+    """Thread-safe per-route rate limiter driven by Discord's headers."""
+
+    def __init__(self, clock=time.monotonic, sleep=time.sleep):
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._route_buckets: Dict[str, str] = {}
+        self._buckets: Dict[str, _Bucket] = {}
+        self._global_reset_at = 0.0
+
+    def _bucket_for(self, route: str) -> _Bucket:
+        bucket_id = self._route_buckets.get(route, route)
+        bucket = self._buckets.get(bucket_id)
+        if bucket is None:
+            bucket = self._buckets[bucket_id] = _Bucket()
+        return bucket
+
+    def acquire(self, route: str):
+        """Block until a request on ``route`` may be sent, then reserve it."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                bucket = self._bucket_for(route)
+                if bucket.reset_at <= now:
+                    # Window elapsed, the next response tells us the new state
+                    bucket.remaining = None
+                wait = max(self._global_reset_at - now, 0.0)
+                if bucket.remaining is not None and bucket.remaining <= 0:
+                    wait = max(wait, bucket.reset_at - now)
+                if wait <= 0:
+                    if bucket.remaining is not None:
+                        bucket.remaining -= 1
+                    return
+            self._sleep(wait)
+
+    def update(self, route: str, response) -> float:
+        """Record the bucket state reported by ``response``.
+
+        Returns the number of seconds to wait before retrying when the
+        response is a 429, otherwise 0.
+        """
+        headers = response.headers
+        now = self._clock()
+        retry_after = 0.0
+
+        if response.status_code == 429:
+            retry_after = _retry_after(response)
+
+        with self._lock:
+            bucket_id = headers.get("X-RateLimit-Bucket")
+            if bucket_id:
+                self._route_buckets[route] = bucket_id
+            bucket = self._bucket_for(route)
+
+            remaining = headers.get("X-RateLimit-Remaining")
+            reset_after = headers.get("X-RateLimit-Reset-After")
+            if remaining is not None and reset_after is not None:
+                try:
+                    bucket.remaining = int(remaining)
+                    bucket.reset_at = now + float(reset_after)
+                except ValueError:
+                    pass
+
+            if response.status_code == 429:
+                is_global = (
+                    headers.get("X-RateLimit-Global", "").lower() == "true"
+                    or headers.get("X-RateLimit-Scope") == "global"
+                )
+                if is_global:
+                    self._global_reset_at = max(self._global_reset_at, now + retry_after)
+                else:
+                    bucket.remaining = 0
+                    bucket.reset_at = max(bucket.reset_at, now + retry_after)
+
+        return retry_after
+
+
+def _retry_after(response) -> float:
+    """Extract the retry delay in seconds from a 429 response."""
+    try:
+        return float(response.json()["retry_after"])
+    except (ValueError, KeyError, TypeError):
+        pass
+    try:
+        return float(response.headers.get("Retry-After", 1))
+    except ValueError:
+        return 1.0
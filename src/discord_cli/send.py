@@ -3,12 +3,140 @@
 import argparse
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from glob import glob
 
-from .config import load_webhook_config
-from .discord_api import send_file_to_discord
+from .archive import FORMATS
+from .config import get_option, load_webhook_config
+from .discord_api import (
+    MAX_ATTACHMENTS, STATUS_QUEUED, SUCCESS_CODES, get_upload_limit, report_result,
+    send_archive_to_discord, send_file_to_discord, send_files_to_discord,
+)
+from .parts import format_size
 
 
-def handle_send_command(file_path, comment=None):
+def progress_printer(label):
+    """Return a progress callback that redraws one stderr line per percent."""
+    last = [-1]
+
+    def show(sent, total):
+        percent = sent * 100 // total if total else 100
+        if percent == last[0]:
+            return
+        last[0] = percent
+        end = "\n" if sent >= total else ""
+        print(f"\rUploading {label}: {percent:3d}% ({format_size(sent)} / {format_size(total)})",
+              end=end, file=sys.stderr, flush=True)
+
+    return show
+
+
+def expand_paths(paths):
+    """Resolve files, directories and glob patterns into a list of files."""
+    files = []
+    for path in paths:
+        matches = sorted(glob(path, recursive=True)) if any(c in path for c in "*?[") else [path]
+        if not matches:
+            print(f"Error: No files match '{path}'.")
+            sys.exit(1)
+        for match in matches:
+            if os.path.isdir(match):
+                for root, dirs, names in os.walk(match):
+                    dirs.sort()
+                    files.extend(os.path.join(root, name) for name in sorted(names))
+            elif os.path.isfile(match):
+                files.append(match)
+            else:
+                print(f"Error: File '{match}' does not exist.")
+                sys.exit(1)
+    return list(dict.fromkeys(files))
+
+
+def batch_files(files, size_limit):
+    """Group files into batches of at most MAX_ATTACHMENTS within ``size_limit``.
+
+    A file above the limit gets a batch of its own and is sent in parts.
+    """
+    batches = []
+    batch, batch_size = [], 0
+    for path in files:
+        size = os.path.getsize(path)
+        if batch and (len(batch) == MAX_ATTACHMENTS or batch_size + size > size_limit):
+            batches.append(batch)
+            batch, batch_size = [], 0
+        batch.append(path)
+        batch_size += size
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def send_many(files, webhook_url, thread_id, needs_thread, comment=None, dedup=True):
+    """Upload files as concurrent batches and print one summary line."""
+    batches = batch_files(files, get_upload_limit())
+    total_size = sum(os.path.getsize(path) for path in files)
+    show = progress_printer(f"{len(files)} files") if sys.stderr.isatty() else None
+    batch_sent = {}
+    lock = threading.Lock()
+
+    def send_batch(number, batch):
+        batch_size = sum(os.path.getsize(path) for path in batch)
+
+        def progress(sent, total):
+            with lock:
+                batch_sent[number] = min(sent, batch_size)
+                show(sum(batch_sent.values()), total_size)
+
+        label = f"{comment} ({number}/{len(batches)})" if comment else f"📎 {number}/{len(batches)}"
+        callback = progress if show else None
+        if len(batch) == 1:
+            return send_file_to_discord(batch[0], webhook_url, thread_id, needs_thread, label, "File",
+                                        progress=callback, dedup=dedup, optimize=True)
+        return send_files_to_discord(batch, webhook_url, thread_id, needs_thread, label, "File",
+                                     progress=callback, dedup=dedup, optimize=True)
+
+    with ThreadPoolExecutor(max_workers=max(get_option("upload_workers"), 1)) as pool:
+        results = list(pool.map(send_batch, range(1, len(batches) + 1), batches))
+
+    sent_files, queued, failed = 0, 0, 0
+    for batch, (status_code, response_text) in zip(batches, results):
+        if status_code in SUCCESS_CODES:
+            sent_files += len(batch)
+        elif status_code == STATUS_QUEUED:
+            queued += len(batch)
+        else:
+            failed += len(batch)
+            print(f"Error sending {', '.join(os.path.basename(path) for path in batch)}: "
+                  f"{status_code} - {response_text}")
+
+    summary = f"Sent {sent_files} of {len(files)} files ({format_size(total_size)}) in {len(batches)} messages"
+    if queued:
+        summary += f", {queued} queued"
+    if failed:
+        summary += f", {failed} failed"
+    print(summary + ".")
+
+
+def send_archive(paths, archive_format, webhook_url, thread_id, needs_thread, comment=None):
+    """Stream an archive of ``paths`` to Discord without writing it to disk."""
+    for path in paths:
+        if not os.path.exists(path):
+            print(f"Error: File '{path}' does not exist.")
+            sys.exit(1)
+
+    try:
+        status_code, response_text = send_archive_to_discord(
+            paths, archive_format, webhook_url, thread_id, needs_thread, comment, "File"
+        )
+    except OSError as e:
+        print(f"Error: Could not archive {e.filename or ''}: {e.strerror or e}")
+        sys.exit(1)
+
+    report_result(status_code, response_text, f"Archive of {', '.join(paths)} sent successfully.", "archive")
+
+
+def handle_send_command(paths, comment=None, archive=False, archive_format="tar.gz", force=False):
     """Handle send command from CLI."""
     try:
         webhook_url, thread_id, needs_thread = load_webhook_config()
@@ -16,18 +144,26 @@ def handle_send_command(file_path, comment=None):
         print(f"Error: {e}")
         sys.exit(1)
 
-    if not os.path.exists(file_path):
-        print(f"Error: File '{file_path}' does not exist.")
+    if archive:
+        send_archive(paths, archive_format, webhook_url, thread_id, needs_thread, comment)
+        return
+
+    files = expand_paths(paths)
+    if not files:
+        print("Error: No files to send.")
         sys.exit(1)
+    if len(files) > 1:
+        send_many(files, webhook_url, thread_id, needs_thread, comment, dedup=not force)
+        return
 
+    file_path = files[0]
+    progress = progress_printer(os.path.basename(file_path)) if sys.stderr.isatty() else None
     status_code, response_text = send_file_to_discord(
-        file_path, webhook_url, thread_id, needs_thread, comment, "File"
+        file_path, webhook_url, thread_id, needs_thread, comment, "File", progress=progress, dedup=not force,
+        optimize=True
     )
 
-    if status_code in [200, 204]:
-        print(f"File '{file_path}' sent successfully.")
-    else:
-        print(f"Error sending file: {status_code} - {response_text}")
+    report_result(status_code, response_text, f"File '{file_path}' sent successfully.", "file")
 
 
 def main():
@@ -35,25 +171,11 @@ def main():
     parser = argparse.ArgumentParser(
         description="Send files to Discord using a webhook."
     )
-    parser.add_argument("file", help="The file to upload")
+    parser.add_argument("files", nargs="+", help="Files, directories or glob patterns to upload")
     parser.add_argument("-c", "--comment", help="Optional comment to include", default=None)
+    parser.add_argument("-a", "--archive", action="store_true",
+                        help="Send everything as one archive, compressed on the fly")
+    parser.add_argument("-f", "--format", choices=FORMATS, default="tar.gz", help="Archive format (default: tar.gz)")
+    parser.add_argument("-F", "--force", action="store_true", help="Upload even if identical content was already posted")
     args = parser.parse_args()
-
-    try:
-        webhook_url, thread_id, needs_thread = load_webhook_config()
-    except ValueError as e:
-        print(f"Error: {e}")
-        sys.exit(1)
-
-    if not os.path.exists(args.file):
-        print(f"Error: File '{args.file}' does not exist.")
-        sys.exit(1)
-
-    status_code, response_text = send_file_to_discord(
-        args.file, webhook_url, thread_id, needs_thread, args.comment, "File"
-    )
-
-    if status_code in [200, 204]:
-        print(f"File '{args.file}' sent successfully.")
-    else:
-        print(f"Error sending file: {status_code} - {response_text}")
\ No newline at end of file
+    handle_send_command(args.files, args.comment, args.archive, args.format, args.force)
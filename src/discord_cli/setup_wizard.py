@@ -3,7 +3,7 @@
 import re
 from typing import Optional
 
-from .config import load_config, save_config
+from .config import config_transaction
 from .discord_discovery import validate_webhook_url, discover_threads_from_webhook
 
 
@@ -183,21 +183,18 @@ def quick_setup():
         thread_name = get_thread_name(thread_id)
 
     # Save configuration
-    config = load_config()
-
-    # Add webhook
-    config["webhooks"][webhook_name] = webhook_url
-    config["settings"]["default_webhook"] = webhook_name
-
-    # Add thread if provided
-    if thread_id and thread_name:
-        config["threads"][thread_name] = thread_id
-        config["settings"]["default_thread"] = thread_name
-        config["settings"]["use_threads"] = True
-    else:
-        config["settings"]["use_threads"] = False
-
-    save_config(config)
+    with config_transaction() as config:
+        # Add webhook
+        config["webhooks"][webhook_name] = webhook_url
+        config["settings"]["default_webhook"] = webhook_name
+
+        # Add thread if provided
+        if thread_id and thread_name:
+            config["threads"][thread_name] = thread_id
+            config["settings"]["default_thread"] = thread_name
+            config["settings"]["use_threads"] = True
+        else:
+            config["settings"]["use_threads"] = False
 
     print()
     print("✅ Setup Complete!")
@@ -0,0 +1,61 @@
+"""Split long text into Discord-sized messages on line boundaries."""
+
+from typing import List, Optional
+
+DISCORD_CHAR_LIMIT = 2000
+FENCE = "```"
+# Room kept free for re-opening and closing a code block around a chunk
+FENCE_RESERVE = 64
+
+
+def _lines(text: str, max_line: int):
+    """Yield the lines of ``text``, hard-splitting lines that can never fit."""
+    for line in text.split("\n"):
+        while len(line) > max_line:
+            yield line[:max_line]
+            line = line[max_line:]
+        yield line
+
+
+def _toggle(fence: Optional[str], line: str) -> Optional[str]:
+    """Return the open code block after ``line``; None when outside of one."""
+    stripped = line.strip()
+    if not stripped.startswith(FENCE):
+        return fence
+    if fence is None:
+        return stripped
+    return None
+
+
+def split_message(text: str, limit: int = DISCORD_CHAR_LIMIT) -> List[str]:
+    """Split ``text`` into chunks of at most ``limit`` characters.
+
+    Chunks break between lines. A code block that spans a break is closed at
+    the end of one chunk and re-opened (with its language) at the start of the
+    next, so every chunk renders with balanced fences.
+    """
+    if len(text) <= limit:
+        return [text]
+
+    chunks = []
+    lines: List[str] = []
+    size = 0
+    fence = None
+
+    for line in _lines(text, limit - FENCE_RESERVE):
+        after = _toggle(fence, line)
+        added = len(line) + (1 if lines else 0)
+        reserve = len(FENCE) + 1 if after else 0
+        if lines and lines != [fence] and size + added + reserve > limit:
+            body = "\n".join(lines)
+            chunks.append(f"{body}\n{FENCE}" if fence else body)
+            lines = [fence] if fence else []
+            size = len(fence) if fence else 0
+            added = len(line) + (1 if lines else 0)
+        lines.append(line)
+        size += added
+        fence = after
+
+    if lines:
+        chunks.append("\n".join(lines))
+    return chunks
@@ -0,0 +1,133 @@
+"""Live mirroring of growing command output into Discord messages."""
+
+import json
+import os
+import tempfile
+import time
+
+from .config import get_option
+from .discord_api import (
+    SUCCESS_CODES, edit_message_on_discord, send_file_to_discord, send_message_to_discord
+)
+from .splitter import DISCORD_CHAR_LIMIT
+
+FENCE_OVERHEAD = len("```\n\n```")
+
+
+class LiveMessageStream:
+    """Post output as one code block message and edit it in place as it grows.
+
+    Edits are throttled to one per ``stream_interval`` seconds. When a message
+    is full the stream rolls over to a new one; after ``stream_max_messages``
+    messages (or if Discord stops accepting edits) the rest of the output is
+    only collected and the complete log is attached when the stream closes.
+    """
+
+    def __init__(self, header, comment, webhook_url, thread_id=None, needs_thread=False, suffix="CLI"):
+        self.target = (webhook_url, thread_id, needs_thread)
+        self.comment = comment
+        self.suffix = suffix
+        self.interval = get_option("stream_interval")
+        self.max_messages = get_option("stream_max_messages")
+
+        self.prefix = f"{comment}\n" if comment else ""
+        self.body = ""
+        self.message_id = None
+        self.messages_sent = 0
+        self.dirty = False
+        self.last_publish = 0.0
+        self.detached = False
+        self.error = None
+
+        self.log = tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False)
+        self.feed(header)
+        self.publish()
+
+    def _capacity(self):
+        return DISCORD_CHAR_LIMIT - len(self.prefix) - FENCE_OVERHEAD
+
+    def _render(self):
+        return f"{self.prefix}```\n{self.body}\n```"
+
+    def feed(self, text):
+        """Add output; full messages are finalized and a new one started."""
+        if not text:
+            return
+        self.log.write(text)
+        if self.detached:
+            return
+
+        while text:
+            room = self._capacity() - len(self.body)
+            if len(text) <= room:
+                self.body += text
+                self.dirty = True
+                break
+
+            # Roll over on the last line boundary that still fits
+            cut = text.rfind("\n", 0, room) + 1 or room
+            self.body += text[:cut]
+            text = text[cut:]
+            self.dirty = True
+            self.publish()
+            if self.detached or self.messages_sent >= self.max_messages:
+                self.detached = True
+                break
+            self.prefix = ""
+            self.body = ""
+            self.message_id = None
+
+    def tick(self):
+        """Publish pending output if the throttle interval has passed."""
+        if self.dirty and not self.detached and time.monotonic() - self.last_publish >= self.interval:
+            self.publish()
+
+    def publish(self):
+        """Create or edit the current message with the buffered output."""
+        if self.detached:
+            return
+        content = self._render()
+        webhook_url, thread_id, needs_thread = self.target
+
+        if self.message_id is None:
+            status_code, response_text = send_message_to_discord(
+                content, webhook_url, thread_id, needs_thread, self.suffix, wait=True
+            )
+            if status_code in SUCCESS_CODES:
+                self.message_id = json.loads(response_text)["id"]
+                self.messages_sent += 1
+        else:
+            status_code, response_text = edit_message_on_discord(
+                self.message_id, content, webhook_url, thread_id, needs_thread
+            )
+
+        self.last_publish = time.monotonic()
+        if status_code in SUCCESS_CODES:
+            self.dirty = False
+        else:
+            self.error = f"{status_code} - {response_text}"
+            self.detached = True
+
+    def close(self):
+        """Publish the remaining output; returns (status_code, response_text).
+
+        If the output did not fit the live messages, the complete log is sent
+        as an attachment.
+        """
+        self.log.close()
+        if not self.detached:
+            if self.dirty:
+                self.publish()
+            if not self.detached:
+                os.remove(self.log.name)
+                return 200, ""
+
+        webhook_url, thread_id, needs_thread = self.target
+        if self.error:
+            note = f"Live output interrupted ({self.error}), full log attached"
+        else:
+            note = f"Output exceeded {self.max_messages} messages, full log attached"
+        comment = f"{self.comment}\n{note}" if self.comment else note
+        return send_file_to_discord(
+            self.log.name, webhook_url, thread_id, needs_thread, comment, self.suffix, temporary=True
+        )
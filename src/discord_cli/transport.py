@@ -0,0 +1,132 @@
+"""Shared HTTP transport for all Discord API calls.
+
+A single pooled ``requests.Session`` is kept per process so consecutive
+webhook calls reuse the same keep-alive TCP+TLS connection to discord.com
+instead of paying a fresh handshake on every upload. Next to the rate
+limiter, a process-wide semaphore keeps at most ``upload_workers`` requests
+in flight, however many threads (parts, batches, async clients) send.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import __version__
+from .config import get_option, get_timeouts
+from .ratelimit import RateLimiter
+
+USER_AGENT = f"discord-cli/{__version__}"
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 16
+
+_session = None
+_session_lock = threading.Lock()
+_limiter = RateLimiter()
+_in_flight = None
+_executor = None
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers["User-Agent"] = USER_AGENT
+                _session = session
+    return _session
+
+
+def close_session():
+    """Close the pooled session and drop its connections."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def _slots() -> threading.BoundedSemaphore:
+    """The process-wide bound on requests in flight."""
+    global _in_flight
+    if _in_flight is None:
+        with _session_lock:
+            if _in_flight is None:
+                _in_flight = threading.BoundedSemaphore(max(get_option("upload_workers"), 1))
+    return _in_flight
+
+
+def executor() -> ThreadPoolExecutor:
+    """Process-wide worker pool for running blocking sends off an event loop."""
+    global _executor
+    if _executor is None:
+        with _session_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=max(get_option("upload_workers"), 1),
+                                               thread_name_prefix="dc-send")
+    return _executor
+
+
+def request(method: str, url: str, timeout=None, **kwargs) -> requests.Response:
+    """Perform an HTTP request through the pooled session.
+
+    ``timeout`` defaults to the configured ``(connect, read)`` timeouts.
+    """
+    if timeout is None:
+        timeout = get_timeouts()
+    return get_session().request(method, url, timeout=timeout, **kwargs)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """Perform a GET request through the pooled session."""
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    """Perform a POST request through the pooled session."""
+    return request("POST", url, **kwargs)
+
+
+def send(method: str, url: str, build=None, **kwargs) -> requests.Response:
+    """Perform a rate limited request, retrying 429 responses.
+
+    Requests on the same route wait for their Discord bucket to refill
+    before being sent, and at most ``upload_workers`` requests of the process
+    are in flight at once. ``build`` may be given instead of keyword arguments;
+    it is called before every attempt and must return fresh request keyword
+    arguments, which lets streamed or file bodies be rewound for a retry.
+    """
+    parts = urlsplit(url)
+    route = f"{method} {parts.netloc}{parts.path}"
+    max_retries = get_option("max_retries")
+
+    attempt = 0
+    while True:
+        _limiter.acquire(route)
+        with _slots():
+            response = request(method, url, **(build() if build else kwargs))
+        _limiter.update(route, response)
+        if response.status_code != 429 or attempt >= max_retries:
+            return response
+        attempt += 1
+
+
+def webhook_request(method: str, url: str, build=None, **kwargs) -> Tuple[int, str]:
+    """Call a webhook endpoint and return (status_code, response_text).
+
+    Connection failures are reported as status code 0 so callers can keep
+    treating every outcome as a (status_code, response_text) pair.
+    """
+    try:
+        response = send(method, url, build=build, **kwargs)
+    except requests.RequestException as e:
+        return 0, f"Request failed: {e}"
+    return response.status_code, response.text
@@ -0,0 +1,127 @@
+"""Index of uploaded content, so identical files are linked instead of re-uploaded.
+
+Each successful upload is recorded in ``uploads.db`` next to the config file,
+keyed by the SHA-256 of the file and the webhook/thread it went to, together
+with the link to the message and attachment Discord created.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Dict, Optional
+
+from .config import CONFIG_PATH, ensure_config_dir
+
+INDEX_PATH = os.path.join(os.path.dirname(CONFIG_PATH), "uploads.db")
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    sha256 TEXT NOT NULL,
+    webhook_url TEXT NOT NULL,
+    thread_id TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    message_url TEXT,
+    attachment_url TEXT,
+    created REAL NOT NULL,
+    PRIMARY KEY (sha256, webhook_url, thread_id)
+);
+CREATE INDEX IF NOT EXISTS uploads_by_size ON uploads (webhook_url, thread_id, size);
+CREATE TABLE IF NOT EXISTS webhooks (
+    webhook_url TEXT PRIMARY KEY,
+    guild_id TEXT
+);
+"""
+
+
+def _connect() -> sqlite3.Connection:
+    """Open the index, creating its tables on first use.
+
+    Use as ``with closing(_connect()) as conn, conn:`` so the connection is
+    closed and its work committed in one transaction.
+    """
+    ensure_config_dir()
+    conn = sqlite3.connect(INDEX_PATH, timeout=10)
+    conn.row_factory = sqlite3.Row
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        conn.executescript(_SCHEMA + f"PRAGMA user_version = {SCHEMA_VERSION};")
+    return conn
+
+
+def size_seen(size: int, webhook_url: str, thread_id: Optional[str] = None) -> bool:
+    """Whether anything of exactly ``size`` bytes was posted to this destination.
+
+    Content of a size never seen cannot be a duplicate, so it need not be
+    hashed before uploading.
+    """
+    with closing(_connect()) as conn, conn:
+        row = conn.execute(
+            "SELECT 1 FROM uploads WHERE webhook_url = ? AND thread_id = ? AND size = ? LIMIT 1",
+            (webhook_url, thread_id or "", size)
+        ).fetchone()
+    return row is not None
+
+
+def lookup(sha256: str, webhook_url: str, thread_id: Optional[str] = None) -> Optional[Dict]:
+    """Return the earlier upload of this content to this destination, if any."""
+    with closing(_connect()) as conn, conn:
+        row = conn.execute(
+            "SELECT * FROM uploads WHERE sha256 = ? AND webhook_url = ? AND thread_id = ?",
+            (sha256, webhook_url, thread_id or "")
+        ).fetchone()
+    return dict(row) if row else None
+
+
+def _guild_id(conn: sqlite3.Connection, webhook_url: str) -> Optional[str]:
+    """The guild a webhook posts into, fetched once and cached in the index."""
+    row = conn.execute("SELECT guild_id FROM webhooks WHERE webhook_url = ?", (webhook_url,)).fetchone()
+    if row:
+        return row["guild_id"]
+
+    from . import transport
+
+    status_code, response_text = transport.webhook_request("GET", webhook_url)
+    if status_code != 200:
+        return None
+    try:
+        guild_id = json.loads(response_text).get("guild_id")
+    except (ValueError, AttributeError):
+        return None
+    conn.execute("INSERT OR REPLACE INTO webhooks VALUES (?, ?)", (webhook_url, guild_id))
+    return guild_id
+
+
+def record(uploads, webhook_url: str, thread_id: Optional[str], response_text: str):
+    """Remember uploaded files using the message Discord returned for them.
+
+    ``uploads`` lists (sha256, filename, size) in attachment order.
+    """
+    try:
+        message = json.loads(response_text)
+    except ValueError:
+        return
+    if not isinstance(message, dict) or "id" not in message:
+        return
+
+    attachments = message.get("attachments") or []
+    with closing(_connect()) as conn, conn:
+        guild_id = _guild_id(conn, webhook_url)
+        message_url = None
+        if guild_id and message.get("channel_id"):
+            message_url = f"https://discord.com/channels/{guild_id}/{message['channel_id']}/{message['id']}"
+        for index, (sha256, filename, size) in enumerate(uploads):
+            attachment_url = attachments[index].get("url") if index < len(attachments) else None
+            conn.execute(
+                "INSERT OR REPLACE INTO uploads VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (sha256, webhook_url, thread_id or "", filename, size, message_url, attachment_url, time.time())
+            )
+
+
+def describe(entry: Dict) -> str:
+    """A short message pointing at an earlier upload of the same content."""
+    posted = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["created"]))
+    link = entry["message_url"] or entry["attachment_url"] or "(link unavailable)"
+    return f"♻️ `{entry['filename']}` was already posted on {posted} (SHA-256 `{entry['sha256'][:16]}…`): {link}"
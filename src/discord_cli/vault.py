@@ -0,0 +1,181 @@
+"""Local store of every credential shared with ``dc creds``.
+
+Credentials are kept in ``creds.db`` next to the config file, one row per
+distinct (username, secret, host, service, domain), together with the
+webhooks/threads they were posted to. Host, service, username and domain are
+indexed case-insensitively, so ``dc creds search`` stays instant over tens of
+thousands of entries, and a credential already posted to a destination can
+be skipped.
+"""
+
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from .config import CONFIG_PATH, ensure_config_dir
+
+VAULT_PATH = os.path.join(os.path.dirname(CONFIG_PATH), "creds.db")
+SCHEMA_VERSION = 1
+
+SEARCH_COLUMNS = ("host", "username", "service", "domain")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS credentials (
+    id INTEGER PRIMARY KEY,
+    username TEXT NOT NULL COLLATE NOCASE,
+    secret TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    host TEXT NOT NULL COLLATE NOCASE,
+    service TEXT NOT NULL COLLATE NOCASE,
+    domain TEXT NOT NULL COLLATE NOCASE,
+    description TEXT,
+    source TEXT,
+    created REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS credentials_key ON credentials (
+    username COLLATE BINARY, secret, host COLLATE BINARY, service COLLATE BINARY, domain COLLATE BINARY
+);
+CREATE INDEX IF NOT EXISTS credentials_by_host ON credentials (host);
+CREATE INDEX IF NOT EXISTS credentials_by_username ON credentials (username);
+CREATE INDEX IF NOT EXISTS credentials_by_service ON credentials (service);
+CREATE INDEX IF NOT EXISTS credentials_by_domain ON credentials (domain);
+CREATE TABLE IF NOT EXISTS postings (
+    credential_id INTEGER NOT NULL REFERENCES credentials (id),
+    webhook_url TEXT NOT NULL,
+    thread_id TEXT NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (credential_id, webhook_url, thread_id)
+);
+"""
+
+
+class Credential(NamedTuple):
+    username: str
+    secret: str
+    kind: str = "password"
+    host: Optional[str] = None
+    service: Optional[str] = None
+    domain: Optional[str] = None
+
+
+def _connect() -> sqlite3.Connection:
+    """Open the vault, creating its tables on first use.
+
+    Use as ``with closing(_connect()) as conn, conn:`` so the connection is
+    closed and its work committed in one transaction.
+    """
+    ensure_config_dir()
+    if not os.path.exists(VAULT_PATH):
+        # The vault holds secrets: create it readable by the owner only
+        os.close(os.open(VAULT_PATH, os.O_RDWR | os.O_CREAT, 0o600))
+    conn = sqlite3.connect(VAULT_PATH, timeout=10)
+    conn.row_factory = sqlite3.Row
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        conn.executescript(_SCHEMA + f"PRAGMA user_version = {SCHEMA_VERSION};")
+    return conn
+
+
+def _key(cred: Credential):
+    return (cred.username or "", cred.secret or "", cred.host or "", cred.service or "", cred.domain or "")
+
+
+def _find(conn: sqlite3.Connection, cred: Credential) -> Optional[int]:
+    row = conn.execute(
+        "SELECT id FROM credentials WHERE username = ? COLLATE BINARY AND secret = ? AND host = ? COLLATE BINARY"
+        " AND service = ? COLLATE BINARY AND domain = ? COLLATE BINARY",
+        _key(cred)
+    ).fetchone()
+    return row["id"] if row else None
+
+
+def _posted_on(conn: sqlite3.Connection, cred: Credential, webhook_url: str, thread_id: Optional[str]):
+    # fetchall() finalizes the statement, so no read lock outlives the call
+    rows = conn.execute(
+        "SELECT p.created FROM credentials c JOIN postings p ON p.credential_id = c.id"
+        " WHERE c.username = ? COLLATE BINARY AND c.secret = ? AND c.host = ? COLLATE BINARY"
+        " AND c.service = ? COLLATE BINARY AND c.domain = ? COLLATE BINARY"
+        " AND p.webhook_url = ? AND p.thread_id = ?",
+        _key(cred) + (webhook_url, thread_id or "")
+    ).fetchall()
+    return rows[0]["created"] if rows else None
+
+
+def posted_on(cred: Credential, webhook_url: str, thread_id: Optional[str] = None) -> Optional[float]:
+    """When this credential was posted to this destination, or None if never."""
+    with closing(_connect()) as conn, conn:
+        return _posted_on(conn, cred, webhook_url, thread_id)
+
+
+def unposted(creds: Iterable[Credential], webhook_url: str, thread_id: Optional[str] = None) -> Iterator[Credential]:
+    """Drop credentials already posted to this destination, or repeated in ``creds``."""
+    seen = set()
+    with closing(_connect()) as conn:
+        for cred in creds:
+            key = _key(cred)
+            if key in seen:
+                continue
+            seen.add(key)
+            if _posted_on(conn, cred, webhook_url, thread_id) is None:
+                yield cred
+
+
+def record(creds: List[Credential], webhook_url: str, thread_id: Optional[str],
+           description: Optional[str] = None, source: Optional[str] = None):
+    """Store credentials and remember that they were posted to this destination."""
+    now = time.time()
+    with closing(_connect()) as conn, conn:
+        for cred in creds:
+            conn.execute(
+                "INSERT OR IGNORE INTO credentials"
+                " (username, secret, kind, host, service, domain, description, source, created)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                _key(cred)[:2] + (cred.kind,) + _key(cred)[2:] + (description, source, now)
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO postings VALUES (?, ?, ?, ?)",
+                (_find(conn, cred), webhook_url, thread_id or "", now)
+            )
+
+
+def posting(creds: List[Credential], description: Optional[str] = None, source: Optional[str] = None) -> Dict:
+    """Describe credentials to ``record`` once the message sharing them is delivered.
+
+    The result is plain JSON, so it can travel with a payload through the
+    daemon and the outbox.
+    """
+    return {"credentials": [list(cred) for cred in creds], "description": description, "source": source}
+
+
+def record_posting(posting: Dict, webhook_url: str, thread_id: Optional[str]):
+    """``record`` the credentials described by ``posting``."""
+    record([Credential(*values) for values in posting["credentials"]], webhook_url, thread_id,
+           posting.get("description"), posting.get("source"))
+
+
+def search(query: Optional[str] = None, host: Optional[str] = None, service: Optional[str] = None,
+           username: Optional[str] = None) -> List[Dict]:
+    """Find stored credentials, most recent first.
+
+    ``query`` matches the start of the host, username, service or domain;
+    ``host``, ``service`` and ``username`` must match exactly. All matching
+    is case-insensitive.
+    """
+    clauses, params = [], []
+    if query:
+        # One indexed range scan per column rather than a LIKE over every row
+        ranges = [f"({column} >= ? AND {column} < ?)" for column in SEARCH_COLUMNS]
+        clauses.append("(" + " OR ".join(ranges) + ")")
+        params += [query, query + "\U0010ffff"] * len(SEARCH_COLUMNS)
+    for column, value in (("host", host), ("service", service), ("username", username)):
+        if value:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+
+    sql = "SELECT * FROM credentials"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    with closing(_connect()) as conn, conn:
+        rows = conn.execute(sql + " ORDER BY created DESC, id DESC", params).fetchall()
+    return [dict(row) for row in rows]
@@ -0,0 +1,40 @@
+"""Tests for the bounded-memory output capture."""
+
+import os
+
+from discord_cli.capture import TAIL_CHARS, OutputCapture
+
+
+def capture_output(preview_chars, chunks):
+    capture = OutputCapture("$ cmd\n", preview_chars)
+    try:
+        for chunk in chunks:
+            capture.feed(chunk)
+    finally:
+        capture.close()
+        os.remove(capture.path)
+    return capture
+
+
+def test_tail_stays_bounded_when_always_attaching():
+    # split_max_messages 0 leaves no inline budget: preview_chars is 0
+    capture = capture_output(0, ("x" * 999 + "\n" for _ in range(1000)))
+    assert capture.total_chars == 1000000
+    assert capture.head == ""
+    assert not capture.complete
+    assert len(capture.tail) == TAIL_CHARS
+
+
+def test_head_and_tail_of_long_output():
+    chunks = [f"line {i}\n" for i in range(10000)]
+    capture = capture_output(100, chunks)
+    text = "".join(chunks)
+    assert capture.head == text[:100]
+    assert capture.tail == text[-TAIL_CHARS:]
+    assert not capture.complete
+
+
+def test_short_output_is_complete():
+    capture = capture_output(100, ["short\n"])
+    assert capture.complete
+    assert capture.head == capture.tail == "short\n"
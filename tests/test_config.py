@@ -0,0 +1,18 @@
+"""Tests for validating tunable options."""
+
+import pytest
+
+from discord_cli.config import parse_option_value
+
+
+def test_upload_workers_must_be_at_least_one():
+    with pytest.raises(ValueError, match="at least 1"):
+        parse_option_value("upload_workers", "0")
+    assert parse_option_value("upload_workers", "1") == 1
+
+
+def test_numbers_must_be_positive():
+    with pytest.raises(ValueError, match="positive"):
+        parse_option_value("upload_workers", "-1")
+    with pytest.raises(ValueError, match="positive"):
+        parse_option_value("daemon_timeout", "0")
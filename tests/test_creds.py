@@ -0,0 +1,49 @@
+"""Tests for recording shared credentials in the vault."""
+
+import pytest
+
+from discord_cli import daemon, discord_api, outbox, vault
+from discord_cli.flush import flush_outbox
+
+WEBHOOK = "https://discord.com/api/webhooks/1/token"
+CRED = vault.Credential("admin", "hunter2", "password", "10.0.0.5", "SSH")
+
+
+@pytest.fixture
+def replies(tmp_path, monkeypatch):
+    """Keep the vault and outbox in tmp_path; Discord answers with the codes queued in the list."""
+    monkeypatch.setattr(vault, "VAULT_PATH", str(tmp_path / "creds.db"))
+    monkeypatch.setattr(outbox, "OUTBOX_PATH", str(tmp_path / "outbox.jsonl"))
+    monkeypatch.setattr(outbox, "OUTBOX_DIR", str(tmp_path / "outbox"))
+    monkeypatch.setattr(outbox, "LOCK_PATH", str(tmp_path / "outbox.lock"))
+    monkeypatch.setattr(daemon, "forward", lambda *args, **kwargs: None)
+    codes = []
+    monkeypatch.setattr(discord_api, "_post_webhook", lambda *args, **kwargs: (codes.pop(0), ""))
+    return codes
+
+
+def share(cred):
+    return discord_api.send_embeds_to_discord([{"title": "creds"}], WEBHOOK, vault_posting=vault.posting([cred]))
+
+
+def test_delivered_share_is_recorded(replies):
+    replies.append(204)
+    assert share(CRED)[0] == 204
+    assert vault.posted_on(CRED, WEBHOOK) is not None
+
+
+def test_queued_share_is_recorded_once_flushed(replies):
+    replies.append(503)
+    assert share(CRED)[0] == discord_api.STATUS_QUEUED
+    assert vault.posted_on(CRED, WEBHOOK) is None
+
+    replies.append(204)
+    assert flush_outbox(quiet=True) == (1, 0)
+    assert vault.posted_on(CRED, WEBHOOK) is not None
+
+
+def test_dropped_share_is_not_recorded(replies):
+    replies.extend([503, 400])
+    share(CRED)
+    assert flush_outbox(quiet=True) == (0, 0)
+    assert vault.posted_on(CRED, WEBHOOK) is None
@@ -0,0 +1,50 @@
+"""Tests for reading command output in dc log."""
+
+import os
+
+from discord_cli import log
+
+
+class CollectingSink:
+    interval = None
+
+    def __init__(self):
+        self.text = ""
+
+    def feed(self, text):
+        self.text += text
+
+    def tick(self):
+        pass
+
+
+def test_pump_reads_dev_null():
+    # epoll refuses /dev/null, so it must be read without the selector
+    sink = CollectingSink()
+    fd = os.open(os.devnull, os.O_RDONLY)
+    try:
+        log.pump(fd, sink)
+    finally:
+        os.close(fd)
+    assert sink.text == ""
+
+
+def test_pump_reads_regular_file(tmp_path):
+    path = tmp_path / "out.txt"
+    path.write_text("line 1\nline 2\n")
+    sink = CollectingSink()
+    with open(path, "rb") as f:
+        log.pump(f.fileno(), sink)
+    assert sink.text == "line 1\nline 2\n"
+
+
+def test_pump_reads_pipe():
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, "héllo\n".encode())
+    os.close(write_fd)
+    sink = CollectingSink()
+    try:
+        log.pump(read_fd, sink)
+    finally:
+        os.close(read_fd)
+    assert sink.text == "héllo\n"
@@ -0,0 +1,22 @@
+"""Tests for splitting large uploads into parts."""
+
+import hashlib
+
+from discord_cli.parts import upload_in_parts
+
+
+def test_upload_in_parts_with_zero_workers(tmp_path):
+    # A hand-edited config can still hold upload_workers 0
+    path = tmp_path / "big.bin"
+    data = bytes(range(256)) * 40
+    path.write_bytes(data)
+    uploaded = []
+
+    def upload_part(part, name, number, total):
+        uploaded.append((name, part))
+        return 200, ""
+
+    results, digest = upload_in_parts(str(path), 4096, upload_part, 0)
+    assert [name for name, *_ in results] == ["big.bin.part001", "big.bin.part002", "big.bin.part003"]
+    assert b"".join(part for _, part in sorted(uploaded)) == data
+    assert digest == hashlib.sha256(data).hexdigest()